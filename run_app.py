@@ -1,15 +1,24 @@
 """Main script to execute the image description and metadata generation project."""
 
+import functools
+import json
 import logging
-import threading
+import os
+import queue
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from tkinter import filedialog, font, messagebox
+from tkinter import filedialog, font, messagebox, ttk
+from types import SimpleNamespace
 
-from src.csv_generator import CSVGenerator
 from src.data.path_manager import get_data_file_path
-from src.image_describer import ImagesDescriber
-from src.services.logging_config import TextHandler, setup_logger
+from src.services.logging_config import (
+    TextHandler,
+    add_log_handler,
+    configure_logging,
+    remove_log_handler,
+    setup_logger,
+)
 
 # Initialize logger using the setup function
 logger = setup_logger(__name__)
@@ -24,6 +33,42 @@ class SmartVisionAIApp:
     with image metadata.
     """
 
+    # Log text colors and bold flag by log level, applied once when the log window is built
+    LOG_TAG_STYLES = (
+        ('DEBUG', 'white', False),
+        ('INFO', 'green', False),
+        ('WARNING', 'yellow', False),
+        ('ERROR', 'red', False),
+        ('CRITICAL', 'red', True),
+    )
+
+    # Wrap length in pixels of the windows description labels
+    WRAP_LENGTH = 400
+
+    # Option windows built by _open_option_window(), keyed by their geometry key
+    OPTION_WINDOWS = {
+        'meta': {
+            'title': "Add Metadata",
+            'description': (
+                "Describe all images in the source folder using ChatGPT, "
+                "add metadata (title, description, keywords, and author name) directly to "
+                "the image files, and save them in the destination folder."
+            ),
+            'with_author': True,
+            'run': 'run_add_metadata',
+        },
+        'csv': {
+            'title': "Generate CSV",
+            'description': (
+                "Describe all images in the source folder using ChatGPT, "
+                "generate a CSV file with the image filename, titles, descriptions,"
+                " and keywords, and save the CSV file to the destination folder."
+            ),
+            'with_author': False,
+            'run': 'run_generate_csv',
+        },
+    }
+
     def __init__(self, root):
         """
         Initialize the SmartVisionAI application.
@@ -38,6 +83,24 @@ class SmartVisionAIApp:
         self.screen_width = root.winfo_screenwidth()
         self.screen_height = root.winfo_screenheight()
 
+        # Compute the windows geometry once, proportional to the screen
+        main_width = int(self.screen_width * 0.4)  # 40% of screen width
+        main_height = int(self.screen_height * 0.4)  # 40% of screen height
+        main_x = (self.screen_width // 2) - (main_width // 2)
+        main_y = (self.screen_height // 2) - (main_height // 2)
+        self._geom = {
+            # Main window placed in the center of the screen
+            'main': f"{main_width}x{main_height}+{main_x}+{main_y}",
+            # 40% of screen width, 35% of screen height
+            'settings': f"{int(self.screen_width * 0.4)}x{int(self.screen_height * 0.35)}",
+            # 40% of screen width, at least 650px or 65% of screen height
+            'meta': f"{int(self.screen_width * 0.4)}x{max(650, int(self.screen_height * 0.65))}",
+            # 40% of screen width, at least 600px or 60% of screen height
+            'csv': f"{int(self.screen_width * 0.4)}x{max(600, int(self.screen_height * 0.6))}",
+            # 70% of screen width, 40% of screen height
+            'log': f"{int(self.screen_width * 0.7)}x{int(self.screen_height * 0.4)}",
+        }
+
         # Define default fonts for the application
         self.default_font = font.Font(
             family="Verdana",
@@ -48,13 +111,63 @@ class SmartVisionAIApp:
             size=int(self.screen_height * 0.018),  # 1,8% of screen height
             weight="bold",
         )
+        self.italic_font = font.Font(family='Verdana', size=10, slant='italic')
+        self.critical_font = font.Font(
+            family="Verdana",
+            size=int(self.screen_height * 0.015),  # same size as the default font
+            weight="bold",
+        )
+
+        # Configure the widgets styles once, shared by all ttk widgets of the app.
+        # The green SAVE and RUN buttons stay classic widgets to keep their colour.
+        self.style = ttk.Style(self.root)
+        self.style.configure('TButton', font=self.default_font)
+        self.style.configure('Big.TButton', font=self.bold_font, padding=(0, 15))
+        self.style.configure('TLabel', font=self.default_font)
+        self.style.configure('Title.TLabel', font=self.bold_font)
+        self.style.configure('Date.TLabel', font=self.italic_font)
+        self.style.configure('TCheckbutton', font=self.default_font)
 
         # Initialize variables to track the windows
         self.app_settings_window = None
-        self.add_metadata_window = None
-        self.generate_csv_window = None
+        self.option_windows = {}
         self.processing_status_window = None
 
+        # Initialize the settings input widget, created with its window
+        self.openai_key_entry = None
+
+        # Folders selected in the previous session, the initial folders of the option windows
+        self._app_state = {'src': '', 'dst': ''}
+
+        # Track the TextHandler attached to the app logger
+        self._text_handler = None
+
+        # Run the processing jobs one at a time in a background thread
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self._worker_future = None
+
+        # Write the data files one at a time in a background thread, in the order of the saves
+        self._data_file_writer = ThreadPoolExecutor(max_workers=1)
+
+        # Processing progress reported by the job, displayed from the main loop
+        self.progress_queue = queue.Queue()
+        self.progress_bar = None
+
+        # Cache of ChatGPT responses, opened on the first run
+        self._response_cache = None
+        self.use_cache = tk.BooleanVar(value=True)
+        self.reuse_similar_prompts = tk.BooleanVar(value=False)
+
+        # Terminate the processes using the images before writing them, not only on a failed write
+        self.strict_lock_check = tk.BooleanVar(value=False)
+
+        # Cache the data files contents to avoid re-reading them on every window open
+        self._prompt_cache = self._read_data_file('prompt_msg.txt')
+        self._openai_key_cache = self._read_data_file('openai_key.txt')
+
+        # Restore the folders selected in the previous session
+        self._load_app_state()
+
         # Open main window
         self._create_main_window()
 
@@ -68,48 +181,39 @@ class SmartVisionAIApp:
         This window opens with app starting and allow users to choose options.
         """
         # Set the main window size and place it in the center of the screen
-        window_width = int(self.screen_width * 0.4)  # 40% of screen width
-        window_height = int(self.screen_height * 0.4)  # 40% of screen height
-
-        x = (self.screen_width // 2) - (window_width // 2)
-        y = (self.screen_height // 2) - (window_height // 2)
-
-        self.root.geometry(f"{window_width}x{window_height}+{x}+{y}")
+        self.root.geometry(self._geom['main'])
 
         # Frame to hold the settings button at the top right
-        top_frame = tk.Frame(self.root)
+        top_frame = ttk.Frame(self.root)
         top_frame.pack(side='top', fill='x', padx=10, pady=10)
 
         # Create a frame for the main buttons and center it
-        button_frame = tk.Frame(self.root)
+        button_frame = ttk.Frame(self.root)
         button_frame.pack(expand=True)
 
         # Create "Settings" button
-        tk.Button(
+        ttk.Button(
             top_frame,
             text='Settings',
-            font=self.default_font,
             command=self._create_app_settings_window,
         ).pack(side='right')
 
         # Create "Add Metadata" button
-        tk.Button(
+        ttk.Button(
             button_frame,
             text='Add Metadata',
-            font=self.bold_font,
-            height=2,
             width=30,
-            command=self._create_add_metadata_window,
+            command=functools.partial(self._open_option_window, 'meta'),
+            style='Big.TButton',
         ).pack(pady=10, expand=True)
 
         # Create "Generate CSV" button
-        tk.Button(
+        ttk.Button(
             button_frame,
             text='Generate CSV',
-            font=self.bold_font,
-            height=2,
             width=30,
-            command=self._create_generate_csv_window,
+            command=functools.partial(self._open_option_window, 'csv'),
+            style='Big.TButton',
         ).pack(pady=10, expand=True)
 
     def _create_app_settings_window(self):
@@ -122,47 +226,42 @@ class SmartVisionAIApp:
         description = "Set up all necessary SmartVisionAI application configurations"
 
         # If the window doesn't exist, create it
-        if self.app_settings_window is None or not tk.Toplevel.winfo_exists(
-            self.app_settings_window
-        ):
+        if self.app_settings_window is None:
             self.app_settings_window = tk.Toplevel(self.root)
             self.app_settings_window.title(title)
 
             # Set window size proportional to the screen
-            window_width = int(self.screen_width * 0.4)  # 40% of screen width
-            window_height = int(self.screen_height * 0.35)  # 35% of screen height
-            self.app_settings_window.geometry(f'{window_width}x{window_height}')
+            self.app_settings_window.geometry(self._geom['settings'])
 
             # Labels and entries for title and description
-            tk.Label(
+            ttk.Label(
                 self.app_settings_window,
                 text=title,
-                font=self.bold_font,
+                style='Title.TLabel',
             ).pack(pady=10)
-            tk.Label(
+            ttk.Label(
                 self.app_settings_window,
                 text=description,
-                font=self.default_font,
-                wraplength=400,
+                wraplength=self.WRAP_LENGTH,
                 justify='center',
             ).pack(pady=10)
 
             # OpenAI API Key label and entry
-            self.openai_key_entry = tk.Entry(self.app_settings_window, width=40)
-            tk.Label(
+            self.openai_key_entry = ttk.Entry(self.app_settings_window, width=40)
+            ttk.Label(
                 self.app_settings_window,
                 text='OpenAI API Key',
-                font=self.default_font,
             ).pack(pady=(10, 0))
             self.openai_key_entry.pack(pady=10)
 
             # Display last OpenAI API key info
             last_updated = self.get_openai_key_date()
-            tk.Label(
+            self.openai_key_date_label = ttk.Label(
                 self.app_settings_window,
                 text=last_updated,
-                font=font.Font(family='Verdana', size=10, slant='italic'),
-            ).pack()
+                style='Date.TLabel',
+            )
+            self.openai_key_date_label.pack()
 
             # Save button
             tk.Button(
@@ -174,315 +273,402 @@ class SmartVisionAIApp:
                 command=self.save_app_settings,
             ).pack(pady=20)
 
+            # Hide the window on close to reuse it on the next open
+            self.app_settings_window.protocol('WM_DELETE_WINDOW', self.app_settings_window.withdraw)
+
         else:
-            # If the window already exists, lift it to the front
-            self.app_settings_window.lift()
-            self.app_settings_window.focus_force()
+            # If the window already exists, refresh its content and show it again
+            self.openai_key_entry.delete(0, tk.END)
+            self.openai_key_date_label.config(text=self.get_openai_key_date())
+            self._show_window(self.app_settings_window)
 
-    def _create_add_metadata_window(self):
+    def _open_option_window(self, key):
         """
-        Open the window for adding metadata to images.
+        Open the option window built from its specification in OPTION_WINDOWS.
 
-        This window allows users to describe images and add metadata (title, description, keywords,
-         and author name) directly to the image files in a selected folder.
-        """
-        title = 'Add Metadata'
-        description = (
-            "Describe all images in the source folder using ChatGPT, "
-            "add metadata (title, description, keywords, and author name) directly to "
-            "the image files, and save them in the destination folder."
-        )
+        The "Add Metadata" and "Generate CSV" windows share the same layout, the window is
+        built on the first open and restored on the next ones.
 
-        # If the window doesn't exist, create it
-        if self.add_metadata_window is None or not tk.Toplevel.winfo_exists(
-            self.add_metadata_window
-        ):
-            self.add_metadata_window = tk.Toplevel(self.root)
-            self.add_metadata_window.title(title)
-
-            # Set window size proportional to the screen
-            window_width = int(self.screen_width * 0.4)  # 40% of screen width
-            window_height = max(
-                650, int(self.screen_height * 0.65)
-            )  # At least 650px or 65% of screen height
-            self.add_metadata_window.geometry(f'{window_width}x{window_height}')
+        Attributes:
+            key (str): The key of the window in OPTION_WINDOWS, 'meta' or 'csv'.
+        """
+        window = self.option_windows.get(key)
 
-            # Labels and entries for title and description
-            tk.Label(
-                self.add_metadata_window,
-                text=title,
-                font=self.bold_font,
-            ).pack(pady=10)
-            tk.Label(
-                self.add_metadata_window,
-                text=description,
-                font=self.default_font,
-                wraplength=400,
-                justify="center",
-            ).pack(pady=10)
+        # If the window already exists, restore its widgets and show it again
+        if window is not None:
+            self._restore_option_window(window)
+            return
 
-            # Entry for prompt input with scrollable Text widget
-            self.prompt_entry = tk.Text(self.add_metadata_window, width=45, height=8, wrap="word")
-            tk.Label(
-                self.add_metadata_window,
-                text="Prompt",
-                font=self.default_font,
-            ).pack(pady=(10, 0))
-            self.prompt_entry.pack(pady=10)
+        spec = self.OPTION_WINDOWS[key]
+        window = tk.Toplevel(self.root)
+        window.title(spec['title'])
+        self.option_windows[key] = window
 
-            # Load the last saved prompt message
-            self.get_prompt_message()
+        # Set window size proportional to the screen
+        window.geometry(self._geom[key])
 
-            # Scrollbar for the Text widget
-            scrollbar = tk.Scrollbar(self.add_metadata_window, command=self.prompt_entry.yview)
-            self.prompt_entry.config(yscrollcommand=scrollbar.set)
+        # Keep the window inputs together, so each window reads its own widgets
+        ctx = self._create_option_context(window, with_author=spec['with_author'])
+        run_callback = getattr(self, spec['run'])
 
+        # Window widgets in display order with their pack options
+        widgets_spec = [
+            # Labels and entries for title and description
+            (ttk.Label(window, text=spec['title'], style='Title.TLabel'), {'pady': 10}),
+            (
+                ttk.Label(
+                    window,
+                    text=spec['description'],
+                    wraplength=self.WRAP_LENGTH,
+                    justify="center",
+                ),
+                {'pady': 10},
+            ),
+            (ttk.Label(window, text="Prompt"), {'pady': (10, 0)}),
+            (ctx.prompt, {'pady': 10}),
             # Folder selection buttons for source and destination
-            self.src_folder_path = tk.StringVar()
-            tk.Button(
-                self.add_metadata_window,
-                text="Select Source Folder",
-                font=self.default_font,
-                command=self.select_src_folder,
-                width=25,
-            ).pack(pady=7)
-            tk.Label(
-                self.add_metadata_window,
-                font=self.default_font,
-                textvariable=self.src_folder_path,
-            ).pack()
-
-            self.dst_folder_path = tk.StringVar()
-            tk.Button(
-                self.add_metadata_window,
-                text="Select Destination Folder",
-                font=self.default_font,
-                command=self.select_dst_folder,
-                width=25,
-            ).pack(pady=7)
-            tk.Label(
-                self.add_metadata_window,
-                font=self.default_font,
-                textvariable=self.dst_folder_path,
-            ).pack()
-
-            self.author_entry = tk.Entry(self.add_metadata_window, width=40)
-            tk.Label(
-                self.add_metadata_window,
-                text="Author Name (optional)",
-                font=self.default_font,
-            ).pack(pady=(10, 0))
-            self.author_entry.pack(pady=5)
-
-            # RUN button to initiate the processing
-            tk.Button(
-                self.add_metadata_window,
-                text="RUN",
-                font=self.bold_font,
-                command=lambda: self.confirm_and_run(self.run_add_metadata),
-                width=15,
-                background='green',
-            ).pack(pady=20)
-
-            # Set the close protocol to save the prompt message when the window closes
-            self.add_metadata_window.protocol(
-                'WM_DELETE_WINDOW',
-                lambda: self.save_prompt_message(current_window=self.add_metadata_window),
+            (
+                ttk.Button(
+                    window,
+                    text="Select Source Folder",
+                    command=functools.partial(self.select_src_folder, ctx),
+                    width=25,
+                ),
+                {'pady': 7},
+            ),
+            (ttk.Label(window, textvariable=ctx.src), {}),
+            (
+                ttk.Button(
+                    window,
+                    text="Select Destination Folder",
+                    command=functools.partial(self.select_dst_folder, ctx),
+                    width=25,
+                ),
+                {'pady': 7},
+            ),
+            (ttk.Label(window, textvariable=ctx.dst), {}),
+        ]
+        if ctx.author is not None:
+            widgets_spec += [
+                (ttk.Label(window, text="Author Name (optional)"), {'pady': (10, 0)}),
+                (ctx.author, {'pady': 5}),
+            ]
+        widgets_spec += [
+            # Option to reuse the cached ChatGPT responses
+            (
+                ttk.Checkbutton(
+                    window,
+                    text="Use cached responses",
+                    variable=self.use_cache,
+                ),
+                {'pady': (10, 0)},
+            ),
+            # Option to also reuse the cached responses of similarly worded prompts
+            (
+                ttk.Checkbutton(
+                    window,
+                    text="Reuse responses of similar prompts",
+                    variable=self.reuse_similar_prompts,
+                ),
+                {'pady': (5, 0)},
+            ),
+        ]
+        if ctx.author is not None:
+            # Only the metadata window writes the images, which other processes may lock
+            widgets_spec.append(
+                (
+                    ttk.Checkbutton(
+                        window,
+                        text="Close the apps using the images before processing",
+                        variable=self.strict_lock_check,
+                    ),
+                    {'pady': (5, 0)},
+                )
             )
+        widgets_spec += [
+            # RUN button to initiate the processing
+            (
+                tk.Button(
+                    window,
+                    text="RUN",
+                    font=self.bold_font,
+                    background='green',
+                    command=functools.partial(self.confirm_and_run, ctx, run_callback),
+                    width=15,
+                ),
+                {'pady': 20},
+            ),
+        ]
+
+        # Lay out all widgets in a single pass
+        for widget, pack_options in widgets_spec:
+            widget.pack(**pack_options)
+
+        # Set the close protocol to save the prompt message when the window closes
+        window.protocol(
+            'WM_DELETE_WINDOW',
+            functools.partial(self.save_prompt_message, ctx, current_window=window),
+        )
 
-        else:
-            # If the window already exists, lift it to the front
-            self.add_metadata_window.lift()
-            self.add_metadata_window.focus_force()
-
-    def _create_generate_csv_window(self):
+    @staticmethod
+    def _show_window(window):
         """
-        Open the window for generating a CSV file from image metadata.
+        Show a previously hidden window and bring it to the front.
 
-        This window allows users to describe images and generate a CSV file with the image filename,
-        titles, descriptions, and keywords, saving it to a selected destination folder.
+        Attributes:
+            window (tk.Toplevel): The window to show.
         """
+        window.deiconify()
+        window.lift()
+        window.focus_force()
 
-        title = "Generate CSV"
-        description = (
-            "Describe all images in the source folder using ChatGPT, "
-            "generate a CSV file with the image filename, titles, descriptions,"
-            " and keywords, and save the CSV file to the destination folder."
-        )
+    def _create_option_context(self, window, with_author):
+        """
+        Create the input widgets of an option window and group them in a context.
 
-        # If the window doesn't exist, create it
-        if self.generate_csv_window is None or not tk.Toplevel.winfo_exists(
-            self.generate_csv_window
-        ):
-            self.generate_csv_window = tk.Toplevel(self.root)  # Create a new top-level window
-            self.generate_csv_window.title(title)
+        Each option window keeps its own context, so running one window never reads the
+        widgets of the other one.
 
-            # Set window size proportional to the screen
-            window_width = int(self.screen_width * 0.4)  # 40% of screen width
-            window_height = max(
-                600, int(self.screen_height * 0.6)
-            )  # At least 600px or 60% of screen height
-            self.generate_csv_window.geometry(f"{window_width}x{window_height}")
+        Attributes:
+            window (tk.Toplevel): The "Add Metadata" or "Generate CSV" window.
+            with_author (bool): Whether the window has an author name entry.
 
-            # Labels and entries for title and description
-            tk.Label(
-                self.generate_csv_window,
-                text=title,
-                font=self.bold_font,
-            ).pack(pady=10)
-            tk.Label(
-                self.generate_csv_window,
-                text=description,
-                font=self.default_font,
-                wraplength=400,
-                justify="center",
-            ).pack(pady=10)
+        Returns:
+            SimpleNamespace: The window context with the prompt, folders, and author inputs.
+        """
+        ctx = SimpleNamespace(
+            window=window,
+            prompt=tk.Text(window, width=45, height=8, wrap="word"),
+            # Folder paths of this window, starting from the last selected folders
+            src=tk.StringVar(window, value=self._app_state['src']),
+            dst=tk.StringVar(window, value=self._app_state['dst']),
+            author=ttk.Entry(window, width=40) if with_author else None,
+            # Track the prompt content to avoid reading the whole Text widget on every access
+            prompt_text='',
+            prompt_dirty=True,
+        )
 
-            # Entry for prompt input with scrollable Text widget
-            self.prompt_entry = tk.Text(self.generate_csv_window, width=45, height=8, wrap="word")
-            tk.Label(
-                self.generate_csv_window,
-                text="Prompt",
-                font=self.default_font,
-            ).pack(pady=(10, 0))
-            self.prompt_entry.pack(pady=10)
+        # Entry for prompt input with scrollable Text widget
+        ctx.prompt.bind('<<Modified>>', functools.partial(self._on_prompt_modified, ctx))
+        scrollbar = ttk.Scrollbar(window, command=ctx.prompt.yview)
+        ctx.prompt.config(yscrollcommand=scrollbar.set)
 
-            # Load the last saved prompt message
-            self.get_prompt_message()
+        # Load the last saved prompt message
+        self.get_prompt_message(ctx)
 
-            # Scrollbar for the Text widget
-            scrollbar = tk.Scrollbar(self.generate_csv_window, command=self.prompt_entry.yview)
-            self.prompt_entry.config(yscrollcommand=scrollbar.set)
+        # Keep the context to restore the window on reopen
+        window.ctx = ctx
+        return ctx
 
-            # Folder selection buttons for source and destination
-            self.src_folder_path = tk.StringVar()
-            tk.Button(
-                self.generate_csv_window,
-                text="Select Source Folder",
-                font=self.default_font,
-                command=self.select_src_folder,
-                width=25,
-            ).pack(pady=7)
-            tk.Label(
-                self.generate_csv_window,
-                font=self.default_font,
-                textvariable=self.src_folder_path,
-            ).pack()
-
-            self.dst_folder_path = tk.StringVar()
-            tk.Button(
-                self.generate_csv_window,
-                text="Select Destination Folder",
-                font=self.default_font,
-                command=self.select_dst_folder,
-                width=25,
-            ).pack(pady=10)
-            tk.Label(
-                self.generate_csv_window,
-                font=self.default_font,
-                textvariable=self.dst_folder_path,
-            ).pack()
+    def _restore_option_window(self, window):
+        """
+        Restore the widgets of a previously built option window and show it again.
 
-            # RUN button to initiate the processing
-            tk.Button(
-                self.generate_csv_window,
-                text="RUN",
-                font=self.bold_font,
-                background='green',
-                width=15,
-                command=lambda: self.confirm_and_run(self.run_generate_csv),
-            ).pack(pady=20)
+        The prompt entry is reloaded with the last saved prompt message, as on the first open.
 
-            # Set the close protocol to save the prompt message when the window closes
-            self.generate_csv_window.protocol(
-                'WM_DELETE_WINDOW',
-                lambda: self.save_prompt_message(current_window=self.generate_csv_window),
-            )
+        Attributes:
+            window (tk.Toplevel): The "Add Metadata" or "Generate CSV" window to restore.
+        """
+        # Load the last saved prompt message
+        window.ctx.prompt.delete('1.0', tk.END)
+        self.get_prompt_message(window.ctx)
 
-        else:
-            # If the window already exists, lift it to the front
-            self.generate_csv_window.lift()
-            self.generate_csv_window.focus_force()
+        self._show_window(window)
 
-    def get_prompt_message(self):
+    @staticmethod
+    def _read_data_file(filename):
         """
-        Load the last saved prompt message from prompt_msg.txt file and display it i the prompt entry widget.
+        Read the content of the specified data file.
+
+        Attributes:
+            filename (str): The name of the data file to read.
+
+        Returns:
+            str: The file content, or an empty string if the file could not be read.
 
         Raises:
             Exception: Logs an error if an unexpected exception occurs during the file read process.
         """
         try:
-            with open(get_data_file_path('prompt_msg.txt'), 'r') as file:
-                last_prompt = file.read()
-                self.prompt_entry.insert('1.0', last_prompt)
+            with open(get_data_file_path(filename), 'r') as file:
+                return file.read()
         except Exception as e:
             logger.error(f"Unexpected error occurred: {e}")
+            return ''
+
+    def get_prompt_message(self, ctx):
+        """
+        Display the last saved prompt message from the in-memory cache in the prompt entry widget.
+
+        Attributes:
+            ctx (SimpleNamespace): The context of the option window.
+        """
+        ctx.prompt.insert('1.0', self._prompt_cache or '')
+        ctx.prompt_dirty = True
+
+    @staticmethod
+    def _on_prompt_modified(ctx, event):
+        """
+        Mark the prompt entry content as changed.
+
+        Attributes:
+            ctx (SimpleNamespace): The context of the option window.
+            event (tk.Event): The <<Modified>> virtual event of the prompt entry widget.
+        """
+        ctx.prompt_dirty = True
+        # Reset the modified flag to receive the event on the next change
+        event.widget.edit_modified(False)
+
+    @staticmethod
+    def get_prompt(ctx):
+        """
+        Get the current prompt message, reading the prompt entry widget only if it has changed.
+
+        Attributes:
+            ctx (SimpleNamespace): The context of the option window.
+
+        Returns:
+            str: The stripped prompt message.
+        """
+        if ctx.prompt_dirty:
+            ctx.prompt_text = ctx.prompt.get('1.0', tk.END).strip()
+            ctx.prompt_dirty = False
+        return ctx.prompt_text
 
     def get_openai_key_date(self):
         """
-        Load the last saved OpenAI API Key from openai_key.txt file and display the generated data.
+        Get the last saved OpenAI API Key date from the in-memory cache.
 
         Returns:
             str: A message indicating the last update date or a default message if no data available.
-
-        Raises:
-            Exception: Logs an error if an unexpected exception occurs during the file read process.
         """
-        try:
-            with open(get_data_file_path('openai_key.txt'), 'r') as file:
-                line = file.read()
-                date = line.split('; ')[0]
-                date_info = f"Last updated OpenAI API Key from {date}"
-                return date_info if line else 'No OpenAI API Key available'
-        except Exception as e:
-            logger.error(f"Unexpected error occurred: {e}")
+        line = self._openai_key_cache
+        date = line.partition('; ')[0]
+        date_info = f"Last updated OpenAI API Key from {date}"
+        return date_info if line else 'No OpenAI API Key available'
 
     def save_app_settings(self):
         """
         Save the SmartVisionAI app configuration settings.
 
-        Writes the OpenAI API Key by the user to 'openai_key.txt'.
+        Writes the OpenAI API Key by the user to 'openai_key.txt' only if it differs from the cached one.
+        The file is written in a background thread to keep the GUI responsive on slow disks.
         """
         openai_key = self.openai_key_entry.get().strip()
 
         if not openai_key:
             messagebox.showerror("Error", "OpenAI API Key is required")
+            return
+
+        # Skip the file write if the key has not changed
+        if openai_key == self._openai_key_cache.partition('; ')[2].strip():
+            self.app_settings_window.withdraw()
+            return
+
+        date = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+        openai_key_record = f"{date}; {openai_key}"
+        self._openai_key_cache = openai_key_record
+
+        self._data_file_writer.submit(
+            self._write_data_file_atomic, 'openai_key.txt', openai_key_record
+        )
+        self.app_settings_window.withdraw()
 
+    @staticmethod
+    def _write_data_file_atomic(filename, content):
+        """
+        Write the content to the specified data file atomically.
+
+        The content is written to a temporary file first, which then replaces the data file,
+        so the data file is never left partially written. The writes run one at a time on the
+        data file writer, so they never share the temporary file.
+
+        Attributes:
+            filename (str): The name of the data file to write.
+            content (str): The content to write.
+
+        Raises:
+            Exception: Logs an error if an unexpected exception occurs during the file write process.
+        """
+        data_file_path = get_data_file_path(filename)
+        tmp_file_path = f"{data_file_path}.tmp"
         try:
-            with open(get_data_file_path('openai_key.txt'), 'w') as openai_file:
-                date = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
-                openai_key_record = f"{date}; {openai_key}"
-                openai_file.write(openai_key_record)
-            self.app_settings_window.destroy()
+            with open(tmp_file_path, 'w') as data_file:
+                data_file.write(content)
+            os.replace(tmp_file_path, data_file_path)
         except Exception as e:
             logger.error(f"Unexpected error occurred: {e}")
 
-    def select_src_folder(self):
+    def _load_app_state(self):
+        """Restore the source and destination folders selected in the previous session."""
+        if not os.path.exists(get_data_file_path('app_state.json')):
+            return
+
+        try:
+            state = json.loads(self._read_data_file('app_state.json') or '{}')
+        except ValueError as e:
+            logger.error(f"Unexpected error occurred: {e}")
+            return
+
+        # Restore only the folders that still exist
+        for key in ('src', 'dst'):
+            folder = state.get(key, '')
+            if folder and os.path.isdir(folder):
+                self._app_state[key] = folder
+
+    def _save_app_state(self, ctx):
+        """
+        Save the source and destination folders of the option window in a background thread.
+
+        The folders are also used as the initial folders of the windows opened afterwards.
+
+        Attributes:
+            ctx (SimpleNamespace): The context of the option window.
+        """
+        self._app_state = {'src': ctx.src.get(), 'dst': ctx.dst.get()}
+        state = json.dumps(self._app_state)
+        self._data_file_writer.submit(self._write_data_file_atomic, 'app_state.json', state)
+
+    @staticmethod
+    def select_src_folder(ctx):
         """
         Open a dialog to select the source folder containing images.
 
-        The selected folder path is stored in the src_folder_path variable.
+        The selected folder path is stored in the source folder variable of the window context.
+
+        Attributes:
+            ctx (SimpleNamespace): The context of the option window.
         """
-        self.src_folder_path.set(filedialog.askdirectory(title="Select Source Folder"))
+        ctx.src.set(filedialog.askdirectory(parent=ctx.window, title="Select Source Folder"))
 
-    def select_dst_folder(self):
+    @staticmethod
+    def select_dst_folder(ctx):
         """
         Open a dialog to select the destination folder for output files.
 
-        The selected folder path is stored in the dst_folder_path variable.
+        The selected folder path is stored in the destination folder variable of the window context.
+
+        Attributes:
+            ctx (SimpleNamespace): The context of the option window.
         """
-        self.dst_folder_path.set(filedialog.askdirectory(title="Select Destination Folder"))
+        ctx.dst.set(filedialog.askdirectory(parent=ctx.window, title="Select Destination Folder"))
 
-    def confirm_and_run(self, run_callback):
+    def confirm_and_run(self, ctx, run_callback):
         """
         Confirm the selected options and run the specified callback function.
 
         Attributes:
-            run_callback (callable): The function to run for processing.
+            ctx (SimpleNamespace): The context of the option window to run.
+            run_callback (callable): The function to run for processing, called with the context.
         """
-        prompt = self.prompt_entry.get('1.0', tk.END).strip()
-        src_folder = self.src_folder_path.get()
-        dst_folder = self.dst_folder_path.get()
+        # Refuse to start a new job while the previous one is still running
+        if self._worker_future is not None and not self._worker_future.done():
+            messagebox.showinfo("Busy", "A job is already running.")
+            return
+
+        prompt = self.get_prompt(ctx)
+        src_folder = ctx.src.get()
+        dst_folder = ctx.dst.get()
 
         # Check for required fields and show error messages if any are missing
         if not prompt:
@@ -502,40 +688,85 @@ class SmartVisionAIApp:
 
         # Ask the user for confirmation before proceeding
         if messagebox.askyesno("Confirm", confirmation_msg):
-            logger_thread = threading.Thread(target=self.run_with_logger, args=(run_callback,))
-            logger_thread.start()
+            # Keep the selected folders for the next session
+            self._save_app_state(ctx)
+
+            # Start the job progress from scratch
+            self.progress_queue = queue.Queue()
+
+            # Show the logger window on the main thread, Tkinter is not thread-safe
+            self.show_logger_window()
+            self.progress_bar.config(value=0)
+            run_callback(ctx)
 
-    def run_with_logger(self, run_callback):
+    def start_worker(self, job):
         """
-        Run the specified callback function and show the logger window.
+        Run the specified job in a background thread to keep the GUI responsive.
+
+        The job must not use Tkinter widgets, all GUI updates are done on the main thread.
 
         Attributes:
-            run_callback (callable): The function to run for processing.
+            job (callable): The processing function to run in the background.
+        """
+        self._worker_future = self.executor.submit(job)
+        self.root.after(100, self._on_done, self._worker_future)
+
+    def _on_done(self, future):
         """
-        self.show_logger_window()
-        run_callback()
+        Wait on the main thread for the background job to finish and log its unexpected errors.
+
+        The job progress is displayed on each poll.
+
+        Attributes:
+            future (concurrent.futures.Future): The future of the submitted job.
+        """
+        self._update_progress()
+
+        if not future.done():
+            self.root.after(100, self._on_done, future)
+            return
+
+        error = future.exception()
+        # SystemExit is raised by the job itself after logging the reason
+        if error is not None and not isinstance(error, SystemExit):
+            logger.error(f"Unexpected error occurred: {error}")
+
+    def _update_progress(self):
+        """Display the latest progress reported by the job in the progress bar."""
+        progress = None
+        while True:
+            try:
+                progress = self.progress_queue.get_nowait()
+            except queue.Empty:
+                break
+
+        if progress is not None and self.progress_bar is not None:
+            done_count, total_count = progress
+            self.progress_bar.config(maximum=total_count, value=done_count)
 
     def show_logger_window(self):
         """
         Display a window to show the processing status and log messages.
 
-        The log messages are updated every second by reading from the log file.
+        The log messages are queued by the TextHandler and displayed from the Tkinter main loop.
         """
 
         # If the window doesn't exist, create it
-        if self.processing_status_window is None or not tk.Toplevel.winfo_exists(
-            self.processing_status_window
-        ):
+        if self.processing_status_window is None:
             self.processing_status_window = tk.Toplevel(self.root)
             self.processing_status_window.title("Processing Status")
 
             # Set window size proportional to the screen
-            window_width = int(self.screen_width * 0.7)  # 70% of screen width
-            window_height = int(self.screen_height * 0.4)  # 40% of screen height
-            self.processing_status_window.geometry(f"{window_width}x{window_height}")
+            self.processing_status_window.geometry(self._geom['log'])
+
+            # Progress bar of the processed images
+            self.progress_bar = ttk.Progressbar(
+                self.processing_status_window, orient='horizontal', mode='determinate'
+            )
+            self.progress_bar.pack(side='bottom', fill='x', padx=10, pady=5)
 
             # Create a frame to hold the Text and Scrollbar
-            frame = tk.Frame(self.processing_status_window)
+            frame = ttk.Frame(self.processing_status_window)
             frame.pack(expand=True, fill='both')
 
             # Create a Text widget for log messages
@@ -543,107 +774,173 @@ class SmartVisionAIApp:
             log_text.pack(expand=True, fill='both', side=tk.LEFT)
 
             # Create a Scrollbar and associate it with the Text widget
-            scrollbar = tk.Scrollbar(frame, command=log_text.yview)
+            scrollbar = ttk.Scrollbar(frame, command=log_text.yview)
             scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
             log_text.config(yscrollcommand=scrollbar.set)
 
-            text_colors = {
-                'DEBUG': 'white',
-                'INFO': 'green',
-                'WARNING': 'yellow',
-                'ERROR': 'red',
-                'CRITICAL': 'red',
-            }
             # Configure tags for each log level
-            for level, color in text_colors.items():
-                if level == 'CRITICAL':
-                    log_text.tag_configure(
-                        level, foreground=color, font=font.Font(family='Verdana', weight='bold')
-                    )
-                log_text.tag_configure(level, foreground=color)
+            for level, color, bold in self.LOG_TAG_STYLES:
+                log_text.tag_configure(
+                    level,
+                    foreground=color,
+                    font=self.critical_font if bold else self.default_font,
+                )
 
             # Set up TextHandler for live logging in the Text widget
-            text_handler = TextHandler(log_text)
-            text_handler.setFormatter(
+            self._text_handler = TextHandler(log_text)
+            self._text_handler.setFormatter(
                 logging.Formatter(
                     '%(asctime)s - %(levelname)s - %(message)s', datefmt='%d/%m/%Y %H:%M:%S'
                 )
             )
 
-            # Attach the TextHandler to the app logger
-            app_logger = setup_logger('root')
-            app_logger.addHandler(text_handler)
+            # Attach the TextHandler to the app log records listener
+            add_log_handler(self._text_handler)
+
+            # Hide the window on close to reuse it on the next run
+            self.processing_status_window.protocol(
+                'WM_DELETE_WINDOW', self.processing_status_window.withdraw
+            )
         else:
-            # If the window already exists, lift it to the front
-            self.processing_status_window.lift()
-            self.processing_status_window.focus_force()
+            # If the window already exists, show it again
+            self._show_window(self.processing_status_window)
 
-    def run_add_metadata(self):
+    def run_add_metadata(self, ctx):
         """
         Execute the process of adding metadata to images.
 
-        This method retrieves input values and calls the ImagesDescriber to add metadata
-        to the images in the specified folder.
+        This method retrieves input values on the main thread and runs the ImagesDescriber
+        in a background thread to add metadata to the images in the specified folder.
+
+        Attributes:
+            ctx (SimpleNamespace): The context of the "Add Metadata" window.
         """
-        prompt = self.prompt_entry.get('1.0', tk.END).strip()
-        src_folder = self.src_folder_path.get()
-        dst_folder = self.dst_folder_path.get()
-        author_name = self.author_entry.get() if hasattr(self, 'author_entry') else None
+        prompt = self.get_prompt(ctx)
+        src_folder = ctx.src.get()
+        dst_folder = ctx.dst.get()
+        author_name = ctx.author.get()
 
         # Save the current prompt message
-        self.save_prompt_message()
+        self.save_prompt_message(ctx)
 
         logger.info("Starting Metadata addition...")
+
+        # Import the describer on demand, it pulls in iptcinfo3, Pillow and requests
+        from src.image_describer import ImagesDescriber
+        from src.services.chatgpt_responder import RequestTemplate
+
         image_describer = ImagesDescriber(
-            prompt=prompt, src_path=src_folder, dst_path=dst_folder, author_name=author_name
+            prompt=prompt,
+            request_template=RequestTemplate(prompt),
+            src_path=src_folder,
+            dst_path=dst_folder,
+            author_name=author_name,
+            cache=self.get_response_cache() if self.use_cache.get() else None,
+            progress_queue=self.progress_queue,
+            reuse_similar_prompts=self.reuse_similar_prompts.get(),
+            strict_lock_check=self.strict_lock_check.get(),
         )
-        image_describer.add_metadata()
+        self.start_worker(image_describer.add_metadata)
 
-    def run_generate_csv(self):
+    def run_generate_csv(self, ctx):
         """
         Execute the process of generating a CSV file from image metadata.
 
-        This method retrieves input values and calls the CSVGenerator to write the image metadata to a CSV file.
+        This method retrieves input values on the main thread and runs the CSVGenerator
+        in a background thread to write the image metadata to a CSV file.
+
+        Attributes:
+            ctx (SimpleNamespace): The context of the "Generate CSV" window.
         """
-        prompt = self.prompt_entry.get('1.0', tk.END).strip()
-        src_folder = self.src_folder_path.get()
-        dst_folder = self.dst_folder_path.get()
+        prompt = self.get_prompt(ctx)
+        src_folder = ctx.src.get()
+        dst_folder = ctx.dst.get()
 
         # Save the current prompt message
-        self.save_prompt_message()
+        self.save_prompt_message(ctx)
 
         logger.info("Starting CSV generation...")
-        csv_generator = CSVGenerator(prompt=prompt, src_path=src_folder, dst_path=dst_folder)
-        csv_generator.write_data_to_csv()
 
-    def save_prompt_message(self, current_window=None):
+        # Import the CSV generator on demand, it pulls in Pillow and requests
+        from src.csv_generator import CSVGenerator
+        from src.services.chatgpt_responder import RequestTemplate
+
+        csv_generator = CSVGenerator(
+            prompt=prompt,
+            request_template=RequestTemplate(prompt),
+            src_path=src_folder,
+            dst_path=dst_folder,
+            cache=self.get_response_cache() if self.use_cache.get() else None,
+            progress_queue=self.progress_queue,
+            reuse_similar_prompts=self.reuse_similar_prompts.get(),
+        )
+        self.start_worker(csv_generator.write_data_to_csv)
+
+    def get_response_cache(self):
+        """
+        Get the cache of ChatGPT responses, opening it on the first call.
+
+        Returns:
+            ResponseCache or None: The responses cache, or None if it could not be opened.
         """
-        Save the current prompt message to prompt_msg.txt file and optionally close the specified window.
+        if self._response_cache is None:
+            # Import the cache on demand, with sqlite3, when the first run opens it
+            from src.services.cache import ResponseCache
+
+            try:
+                self._response_cache = ResponseCache()
+            except Exception as e:
+                logger.error(f"Failed to open the response cache: {e}")
+
+        return self._response_cache
+
+    def save_prompt_message(self, ctx, current_window=None):
+        """
+        Save the current prompt message to prompt_msg.txt file and optionally hide the specified window.
+
+        The file is written only if the prompt message differs from the cached one.
 
         Attributes:
+            ctx (SimpleNamespace): The context of the option window holding the prompt.
             current_window (tk.Toplevel, optional): The currently open app window. Defaults to None.
 
         Raises:
             Exception: Logs an error if an unexpected exception occurs during the file write process.
         """
-        try:
-            with open(get_data_file_path('prompt_msg.txt'), 'w') as file:
-                file.write(self.prompt_entry.get('1.0', tk.END).strip())
-        except Exception as e:
-            logger.error(f"Unexpected error occurred: {e}")
+        prompt = self.get_prompt(ctx)
+
+        if prompt != self._prompt_cache:
+            try:
+                with open(get_data_file_path('prompt_msg.txt'), 'w') as file:
+                    file.write(prompt)
+                self._prompt_cache = prompt
+            except Exception as e:
+                logger.error(f"Unexpected error occurred: {e}")
 
         if current_window:
-            current_window.destroy()
+            current_window.withdraw()
 
     def confirm_close_app(self):
         """
         Show a confirmation dialog before closing the application.
         """
         if messagebox.askokcancel('Quit', "Are you sure you want to exit?"):
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+            # Finish writing the data files saved before closing
+            self._data_file_writer.shutdown(wait=True)
+
+            # Stop displaying the log records in the Text widget destroyed with the app
+            if self._text_handler is not None:
+                remove_log_handler(self._text_handler)
+                self._text_handler = None
+
             self.root.destroy()
 
 
 if __name__ == "__main__":
+    log_listener = configure_logging()
     root = tk.Tk()
     app = SmartVisionAIApp(root)
     root.mainloop()
+    log_listener.stop()
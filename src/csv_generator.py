@@ -4,10 +4,12 @@ import csv
 import os
 import sys
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
+from src.services.chatgpt_responder import MAX_CONCURRENT_REQUESTS, RequestTemplate
 from src.services.img_metadata_reader import get_metadata
 from src.services.files_filter import filter_files_by_extension
+from src.services.image_preprocessor import load_image
 from src.services.logging_config import setup_logger
 from src.services.process_timer import execution_timer
 from src.services.response_parser import parse_response
@@ -15,6 +17,12 @@ from src.services.response_parser import parse_response
 # Initialize logger using the setup function
 logger = setup_logger(__name__)
 
+# Columns of the generated CSV file
+CSV_FIELDS = ['image_name', 'title', 'description', 'keywords']
+
+# Write buffer of the CSV file, rows are flushed to disk in large chunks
+CSV_WRITE_BUFFER = 1 << 20
+
 
 class CSVGenerator:
     """
@@ -26,11 +34,26 @@ class CSVGenerator:
             Generates a CSV file containing the file names, titles, descriptions, and keywords of the processed images.
             Saves the CSV file in the destination directory.
 
+        iter_rows(image_files):
+            Yields the CSV rows of the images as they are described.
+
+        describe_image(image):
+            Gets the title, description, and keywords of a single image from the GPT model.
+
         __str__():
             Returns a string representation of the CSVGenerator instance.
     """
 
-    def __init__(self, prompt, src_path, dst_path=None):
+    def __init__(
+        self,
+        prompt,
+        src_path,
+        dst_path=None,
+        cache=None,
+        request_template=None,
+        progress_queue=None,
+        reuse_similar_prompts=False,
+    ):
         """
         Initialize the CSVGenerator with a prompt, source path, and optionally a destination path.
 
@@ -39,10 +62,21 @@ class CSVGenerator:
             src_path (str): The path to the directory containing the images to be processed.
             dst_path (str, optional): The path to the directory where the generated CSV file will be saved.
                                       Defaults to src_path if not provided.
+            cache (ResponseCache, optional): The cache of ChatGPT responses. Defaults to None.
+            request_template (RequestTemplate, optional): The request body prepared for the prompt.
+                                                          Built from the prompt if not provided.
+            progress_queue (queue.Queue, optional): The queue receiving the (done, total) progress
+                                                    of the processing. Defaults to None.
+            reuse_similar_prompts (bool, optional): Whether to reuse the cached responses of
+                                                    similar prompts. Defaults to False.
         """
         self.prompt = prompt
         self.src_path = src_path
         self.dst_path = dst_path if dst_path else src_path
+        self.cache = cache
+        self.request_template = request_template if request_template else RequestTemplate(prompt)
+        self.progress_queue = progress_queue
+        self.reuse_similar_prompts = reuse_similar_prompts
 
     def write_data_to_csv(self):
         """Write image metadata (image_name, title, description, keywords) to a single CSV file."""
@@ -68,52 +102,30 @@ class CSVGenerator:
         )
 
         # Ensure destination directory exists; create if it doesn't
-        if not os.path.exists(self.dst_path):
-            os.makedirs(self.dst_path, exist_ok=True)
+        os.makedirs(self.dst_path, exist_ok=True)
 
         # Get the current datetime and format for the CSV file name
-        current_datetime = datetime.now().strftime('%d-%m-%Y--%H-%M-%S')
+        current_datetime = time.strftime('%d-%m-%Y--%H-%M-%S')
         csv_filepath = os.path.join(self.dst_path, f"{current_datetime}.csv")
 
         try:
             # Open the CSV file for writing
-            with open(csv_filepath, mode='w', newline='', encoding='utf-8') as csv_file:
-                writer = csv.writer(csv_file)
+            with open(
+                csv_filepath, mode='w', newline='', encoding='utf-8', buffering=CSV_WRITE_BUFFER
+            ) as csv_file:
+                writer = csv.DictWriter(csv_file, fieldnames=CSV_FIELDS)
 
                 # Write the CSV header
-                writer.writerow(['image_name', 'title', 'description', 'keywords'])
-
-                # Process each image file and write its data to CSV file
-                for image_name in filtered_image_files:
-                    image_path = os.path.join(self.src_path, image_name)
-
-                    try:
-                        with open(image_path, 'rb') as image_file:
-                            # Get image caption from image metadata
-                            image_caption = get_metadata(image_path)
-                            if not image_caption:
-                                logger.warning(
-                                    f"The file '{image_name}' does not contain metadata. "
-                                    "Title, description, and keywords will be generated "
-                                    "without using the image caption."
-                                )
-
-                            # Get cleaned data from GPT response
-                            title, description, keywords = parse_response(
-                                image_file=image_file,
-                                prompt=self.prompt,
-                                image_caption=image_caption,
-                            )
-                            keywords_str = ','.join(keywords)
-                            # Write the data to the CSV file
-                            writer.writerow([image_name, title, description, keywords_str])
-                            logger.info(
-                                f"Image name, title, description, and keywords of {image_name} (JPEG) "
-                                f"were successfully added to CSV file."
-                            )
-                            processed_count += 1
-                    except Exception as e:
-                        logger.error(f"Error processing {image_name}: {e}")
+                writer.writeheader()
+
+                # Write each image data to the CSV file as soon as it is described
+                for row in self.iter_rows(filtered_image_files):
+                    writer.writerow(row)
+                    logger.info(
+                        f"Image name, title, description, and keywords of {row['image_name']} (JPEG) "
+                        f"were successfully added to CSV file."
+                    )
+                    processed_count += 1
 
             logger.info(f"CSV file created successfully at: {csv_filepath}")
         except Exception as e:
@@ -133,6 +145,70 @@ class CSVGenerator:
             process_time=process_time,
         )
 
+    def iter_rows(self, image_files):
+        """
+        Describe the images concurrently and yield their CSV rows in the order of the image files.
+
+        Args:
+            image_files (list): The (name, path, size) tuples of the image files to process.
+
+        Yields:
+            dict: The CSV row of each successfully processed image.
+        """
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            rows = executor.map(self.describe_image, image_files)
+            for done_count, row in enumerate(rows, start=1):
+                # Report the progress to the GUI, which polls the queue on its main loop
+                if self.progress_queue is not None:
+                    self.progress_queue.put((done_count, len(image_files)))
+
+                if row is not None:
+                    yield row
+
+    def describe_image(self, image):
+        """
+        Get the title, description, and keywords of the image from the GPT model.
+
+        Args:
+            image (tuple): The (name, path, size) tuple of the image file in the source directory.
+
+        Returns:
+            dict or None: The CSV row of the image, or None if the image could not be processed.
+        """
+        image_name, image_path, image_size = image
+
+        try:
+            # Read the image once, its content is shared by the metadata reader and the request
+            with load_image(image_path, image_size) as image_file:
+                # Get image caption from image metadata
+                image_caption = get_metadata(image_path, image_file, cache=self.cache)
+                if not image_caption:
+                    logger.warning(
+                        f"The file '{image_name}' does not contain metadata. "
+                        "Title, description, and keywords will be generated "
+                        "without using the image caption."
+                    )
+
+                # Get cleaned data from GPT response
+                title, description, keywords = parse_response(
+                    image_file=image_file,
+                    prompt=self.prompt,
+                    image_caption=image_caption,
+                    cache=self.cache,
+                    request_template=self.request_template,
+                    reuse_similar_prompts=self.reuse_similar_prompts,
+                    image_name=image_name,
+                )
+                return {
+                    'image_name': image_name,
+                    'title': title,
+                    'description': description,
+                    'keywords': ','.join(keywords),
+                }
+        except Exception as e:
+            logger.error(f"Error processing {image_name}: {e}")
+            return None
+
     def __str__(self):
         """
         Return a string representation of the CSVGenerator instance.
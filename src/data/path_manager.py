@@ -1,20 +1,21 @@
 """Module to check and create a path to data files."""
 
+import functools
 import os
 import platform
 import sys
 
 
-def app_storage(op_system, filename):
+@functools.lru_cache(maxsize=None)
+def _storage_dir(op_system):
     """
-    Create and return the full path to a file in the application specific storage directory.
+    Create the application specific storage directory once and return its path.
 
     Attributes:
         op_system (str): The operating system name.
-        filename (str): The name of the file to create or access in the app storage.
 
     Returns:
-        str: The full path to the file in the app's storage directory.
+        str: The path to the app's storage directory.
     """
     if op_system == 'Darwin':  # macOS
         app_support_dir = os.path.expanduser('~/Library/Application Support/SmartVisionAI/')
@@ -26,7 +27,21 @@ def app_storage(op_system, filename):
 
     os.makedirs(app_support_dir, exist_ok=True)
 
-    return os.path.join(app_support_dir, filename)
+    return app_support_dir
+
+
+def app_storage(op_system, filename):
+    """
+    Create and return the full path to a file in the application specific storage directory.
+
+    Attributes:
+        op_system (str): The operating system name.
+        filename (str): The name of the file to create or access in the app storage.
+
+    Returns:
+        str: The full path to the file in the app's storage directory.
+    """
+    return os.path.join(_storage_dir(op_system), filename)
 
 
 def get_data_file_path(filename):
@@ -42,7 +57,7 @@ def get_data_file_path(filename):
 
     # Check if running in PyInstaller bundle
     if hasattr(sys, '_MEIPASS'):
-        # Get the operating system name
+        # Get the operating system name, the storage directory is created on the first access
         op_system = platform.system()
         file_path = app_storage(op_system, filename)
     else:
@@ -3,13 +3,19 @@
 import os
 import shutil
 import sys
-import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from iptcinfo3 import IPTCInfo
 
-from src.services.check_access import terminate_processes_using_file
+from src.services.chatgpt_responder import MAX_CONCURRENT_REQUESTS, RequestTemplate
+from src.services.check_access import (
+    get_open_files_index,
+    terminate_processes_using_file,
+)
 from src.services.files_filter import filter_files_by_extension
+from src.services.image_preprocessor import open_image
 from src.services.img_metadata_reader import get_metadata
 from src.services.logging_config import setup_logger
 from src.services.process_timer import execution_timer
@@ -28,6 +34,21 @@ class ImagesDescriber:
             Adds processed titles, descriptions, and keywords to the metadata of the images in the source directory.
             Saves the processed images in the destination directory.
 
+        describe_image(image):
+            Adds the processed title, description, and keywords to the metadata of a single image.
+
+        is_completed(image_path, image_size):
+            Checks if the image already holds the metadata generated for the prompt.
+
+        move_completed_image(image_name, image_path, destination_path):
+            Static method. Moves the image already holding its metadata to the destination.
+
+        get_open_files_index():
+            Returns the processes using the images, scanned once per run when first needed.
+
+        save_image(info, image_path, destination_path):
+            Writes the image with its IPTC metadata, retrying once if it is locked.
+
         remove_backup_file(filename):
             Static method. Removes the backup file created by the IPTCInfo library, if it exists.
             Typically, backup files have a '~' suffix.
@@ -36,7 +57,18 @@ class ImagesDescriber:
             Returns a string representation of the ImagesDescriber instance.
     """
 
-    def __init__(self, prompt, src_path, dst_path, author_name):
+    def __init__(
+        self,
+        prompt,
+        src_path,
+        dst_path,
+        author_name,
+        cache=None,
+        request_template=None,
+        progress_queue=None,
+        reuse_similar_prompts=False,
+        strict_lock_check=False,
+    ):
         """
         Initialize the ImagesDescriber with a prompt, source path, destination path, and author name.
 
@@ -45,11 +77,30 @@ class ImagesDescriber:
             src_path (str): The path to the directory containing the images to be processed.
             dst_path (str): The path to the directory where processed images will be saved. Defaults to src_path if not provided.
             author_name (str): The name of the author for the images.
+            cache (ResponseCache, optional): The cache of ChatGPT responses. Defaults to None.
+            request_template (RequestTemplate, optional): The request body prepared for the prompt.
+                                                          Built from the prompt if not provided.
+            progress_queue (queue.Queue, optional): The queue receiving the (done, total) progress
+                                                    of the processing. Defaults to None.
+            reuse_similar_prompts (bool, optional): Whether to reuse the cached responses of
+                                                    similar prompts. Defaults to False.
+            strict_lock_check (bool, optional): Whether to terminate the processes using each image
+                                                before processing it. By default, the processes
+                                                are terminated only if the image write fails.
         """
         self.prompt = prompt
         self.src_path = src_path
         self.dst_path = dst_path if dst_path else src_path
         self.author_name = author_name
+        self.cache = cache
+        self.request_template = request_template if request_template else RequestTemplate(prompt)
+        self.progress_queue = progress_queue
+        self.reuse_similar_prompts = reuse_similar_prompts
+        self.strict_lock_check = strict_lock_check
+
+        # Processes using the images, found once per run when first needed
+        self.open_files_index = None
+        self._open_files_index_lock = threading.Lock()
 
     def add_metadata(self):
         """
@@ -60,9 +111,6 @@ class ImagesDescriber:
         # Record the start time of the process of handling the images
         time_start = time.perf_counter()
 
-        # Initialize counter for images
-        processed_count = 0
-
         # Get filtered image files to process
         filtered_image_files = filter_files_by_extension(src_path=self.src_path)
 
@@ -78,83 +126,31 @@ class ImagesDescriber:
             f"Images processing has started! {len(filtered_image_files)} images to process."
         )
 
-        # Get title, description, and keywords for each image file
-        for image_name in filtered_image_files:
-            image_path = os.path.join(self.src_path, image_name)
-            destination_path = os.path.join(self.dst_path, image_name)
-
-            # Ensure destination directory exists; create if it doesn't
-            if not os.path.exists(destination_path):
-                os.makedirs(self.dst_path, exist_ok=True)
-
-            # Terminate processes using the image file
-            terminate_processes_using_file(image_path)
-
-            # Track if image processing succeeds
-            successfully_processed = False
-
-            try:
-                with open(image_path, 'rb') as image_file:
-                    # Create a temporary copy of the image
-                    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                        temp_image_path = temp_file.name
-                    shutil.copyfile(image_path, temp_image_path)
-
-                    # Load IPTC metadata or create a new one
-                    try:
-                        info = IPTCInfo(temp_image_path)
-                    except Exception as e:
-                        logger.error(f"No IPTC metadata found, create a new one. Error: {e}")
-                        info = IPTCInfo(None)
-
-                    # Get image caption from image metadata
-                    image_caption = get_metadata(temp_image_path)
-                    if not image_caption:
-                        logger.warning(
-                            f"The file '{image_name}' does not contain metadata. "
-                            "Title, description, and keywords will be generated "
-                            "without using the image caption."
-                        )
-
-                    # Get cleaned data from GPT response
-                    title, description, keywords = parse_response(
-                        image_file=image_file,
-                        prompt=self.prompt,
-                        image_caption=image_caption,
-                    )
-
-                    # Modify metadata on the temporary file
-                    info['object name'] = title
-                    info['caption/abstract'] = description
-                    info['keywords'] = keywords
-                    info['by-line'] = self.author_name
-
-                    # Save the modified metadata back to the temp file
-                    info.save_as(temp_image_path)
-                    shutil.move(temp_image_path, destination_path)
-                    logger.info(
-                        f"Metadata added to {image_name} (JPEG) "
-                        f"{'and moved to ' + os.path.dirname(destination_path) if destination_path != image_path else ''}"
-                    )
-                    processed_count += 1
-                    successfully_processed = True
-
-            except Exception as e:
-                logger.error(f"Error adding metadata to {image_name}: {e}")
-            finally:
-                # Ensure backup files are removed regardless of success or failure
-                self.remove_backup_file(destination_path)
+        # Ensure destination directory exists; create if it doesn't
+        os.makedirs(self.dst_path, exist_ok=True)
 
-                # Clean up temp file if it exists and is not needed
-                if temp_image_path and os.path.exists(temp_image_path):
-                    os.remove(temp_image_path)
+        # Scan the processes using the images again on this run, up front if requested
+        self.open_files_index = None
+        if self.strict_lock_check:
+            self.get_open_files_index()
 
-            # Remove the original file only if successfully processed and moved
-            if successfully_processed and image_path != destination_path:
-                os.remove(image_path)
+        # Describe the images concurrently, the requests to the OpenAI API are I/O bound
+        processed_count = 0
+        skipped_count = 0
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            results = executor.map(self.describe_image, filtered_image_files)
+            for done_count, successfully_processed in enumerate(results, start=1):
+                if successfully_processed is None:
+                    skipped_count += 1
+                else:
+                    processed_count += successfully_processed
+
+                # Report the progress to the GUI, which polls the queue on its main loop
+                if self.progress_queue is not None:
+                    self.progress_queue.put((done_count, len(filtered_image_files)))
 
         # Calculate the number of unprocessed images
-        unprocessed_count = len(filtered_image_files) - processed_count
+        unprocessed_count = len(filtered_image_files) - processed_count - skipped_count
 
         # Display the images processing time
         process_time = time.perf_counter() - time_start
@@ -164,7 +160,182 @@ class ImagesDescriber:
             processed_count=processed_count,
             unprocessed_count=unprocessed_count,
             process_time=process_time,
+            skipped_count=skipped_count,
+        )
+
+    def describe_image(self, image):
+        """
+        Add the processed title, description, and keywords to the metadata of the image.
+
+        Args:
+            image (tuple): The (name, path, size) tuple of the image file in the source directory.
+
+        Returns:
+            bool or None: True if the image was successfully processed, False otherwise,
+                          None if the image already holds its metadata and was left in place.
+        """
+        image_name, image_path, image_size = image
+        destination_path = os.path.join(self.dst_path, image_name)
+
+        # Terminate processes using the image file before processing it, if requested
+        if self.strict_lock_check:
+            terminate_processes_using_file(image_path, self.get_open_files_index())
+
+        # Track if image processing succeeds
+        successfully_processed = False
+
+        try:
+            # Skip the description if the image already holds the metadata generated for the prompt
+            if self.cache is not None and self.is_completed(image_path, image_size):
+                return self.move_completed_image(image_name, image_path, destination_path)
+
+            with open_image(image_path, image_size) as image_file:
+                # Load IPTC metadata or create a new one
+                try:
+                    info = IPTCInfo(image_path)
+                except Exception as e:
+                    logger.error(f"No IPTC metadata found, create a new one. Error: {e}")
+                    info = IPTCInfo(None)
+
+                # Get image caption from image metadata, reusing the IPTC metadata loaded above
+                image_caption = get_metadata(image_path, cache=self.cache, iptc_info=info)
+                if not image_caption:
+                    logger.warning(
+                        f"The file '{image_name}' does not contain metadata. "
+                        "Title, description, and keywords will be generated "
+                        "without using the image caption."
+                    )
+
+                # Get cleaned data from GPT response
+                title, description, keywords = parse_response(
+                    image_file=image_file,
+                    prompt=self.prompt,
+                    image_caption=image_caption,
+                    cache=self.cache,
+                    request_template=self.request_template,
+                    reuse_similar_prompts=self.reuse_similar_prompts,
+                    image_name=image_name,
+                )
+
+            # Modify metadata
+            info['object name'] = title
+            info['caption/abstract'] = description
+            info['keywords'] = keywords
+            info['by-line'] = self.author_name
+
+            # Write the image with the modified metadata to the destination once the source file
+            # is closed, as the IPTC writer renames an existing destination file to a backup
+            # and Windows refuses to rename a file left open. The IPTC block is patched in the
+            # JPEG bytes without re-encoding the image data
+            self.save_image(info, image_path, destination_path)
+
+            # Record the written image to skip it on the next runs
+            if self.cache is not None:
+                with open(destination_path, 'rb') as written_file:
+                    completion_key = self.cache.make_completion_key(
+                        self.prompt, self.cache.image_key(written_file), self.author_name
+                    )
+                self.cache.mark_completed(completion_key)
+
+            logger.info(
+                f"Metadata added to {image_name} (JPEG) "
+                f"{'and moved to ' + os.path.dirname(destination_path) if destination_path != image_path else ''}"
+            )
+            successfully_processed = True
+
+        except Exception as e:
+            logger.error(f"Error adding metadata to {image_name}: {e}")
+        finally:
+            # Ensure backup files are removed regardless of success or failure
+            self.remove_backup_file(destination_path)
+
+        # Remove the original file only if successfully processed and moved
+        if successfully_processed and image_path != destination_path:
+            os.remove(image_path)
+
+        return successfully_processed
+
+    def is_completed(self, image_path, image_size):
+        """
+        Check if the image was already written with the metadata generated for the prompt.
+
+        Args:
+            image_path (str): The path to the image file.
+            image_size (int): The size of the image file.
+
+        Returns:
+            bool: True if the image already holds the metadata, False otherwise.
+        """
+        with open_image(image_path, image_size) as image_file:
+            completion_key = self.cache.make_completion_key(
+                self.prompt, self.cache.image_key(image_file), self.author_name
+            )
+        return self.cache.is_completed(completion_key)
+
+    @staticmethod
+    def move_completed_image(image_name, image_path, destination_path):
+        """
+        Move the image already holding its metadata to the destination, without describing it again.
+
+        Args:
+            image_name (str): The name of the image file.
+            image_path (str): The path to the source image file.
+            destination_path (str): The path to the destination image file.
+
+        Returns:
+            bool or None: True if the image was moved to the destination, None if the destination
+                          is the source image, which is left in place.
+        """
+        if image_path == destination_path:
+            logger.info(
+                f"The file '{image_name}' already contains metadata for this prompt, skipped."
+            )
+            return None
+
+        shutil.move(image_path, destination_path)
+        logger.info(
+            f"The file '{image_name}' already contains metadata for this prompt, "
+            f"moved to {os.path.dirname(destination_path)} without describing it again."
         )
+        return True
+
+    def get_open_files_index(self):
+        """
+        Get the processes using the images in the source and destination directories.
+
+        The processes are scanned once per run, on the first call, and the index is shared by all
+        the images instead of scanning all the processes for each locked image.
+
+        Returns:
+            dict: The normalized file paths to the list of processes using them.
+        """
+        with self._open_files_index_lock:
+            if self.open_files_index is None:
+                self.open_files_index = get_open_files_index({self.src_path, self.dst_path})
+            return self.open_files_index
+
+    def save_image(self, info, image_path, destination_path):
+        """
+        Write the image with its IPTC metadata to the destination.
+
+        If the write fails because the image is locked, the processes using it are terminated and
+        the write is retried once.
+
+        Args:
+            info (IPTCInfo): The IPTC metadata of the image to write.
+            image_path (str): The path to the source image file.
+            destination_path (str): The path to the image file to write.
+        """
+        try:
+            info.save_as(destination_path)
+        except OSError as e:
+            logger.warning(
+                f"Failed to write {os.path.basename(destination_path)}, terminating processes "
+                f"using the file and retrying. Error: {e}"
+            )
+            for filepath in {image_path, destination_path}:
+                terminate_processes_using_file(filepath, self.get_open_files_index())
+            info.save_as(destination_path)
 
     @staticmethod
     def remove_backup_file(filename):
@@ -0,0 +1,427 @@
+"""Module to cache ChatGPT responses in a local SQLite database."""
+
+import functools
+import hashlib
+import io
+import mmap
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Optional
+
+from src.data.path_manager import get_data_file_path
+from src.services.json_codec import json_dumps, json_loads
+from src.services.logging_config import setup_logger
+
+# Initialize logger using the setup function
+logger = setup_logger(__name__)
+
+# Sentence embedding model used to match near-identical prompts (optional dependency)
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+
+# Maximum cosine distance between two prompts to reuse a cached response
+SIMILARITY_MAX_DISTANCE = 0.1
+
+# Length in bytes of the prompt part of the cache key
+PROMPT_HASH_SIZE = 32
+
+_embedding_model_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_embedding_model():
+    """
+    Load the sentence embedding model once, if the optional dependency is installed.
+
+    Returns:
+        SentenceTransformer or None: The embedding model, or None if not available.
+    """
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        logger.info(
+            "Install 'sentence-transformers' to reuse cached responses for similar prompts."
+        )
+        return None
+
+    try:
+        return SentenceTransformer(EMBEDDING_MODEL)
+    except Exception as e:
+        logger.error(f"Failed to load the embedding model: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=1024)
+def _embed(text):
+    """
+    Compute the normalized embedding vector of the text.
+
+    Args:
+        text (str): The text to embed.
+
+    Returns:
+        bytes or None: The embedding as packed float32 values, or None if not available.
+    """
+    with _embedding_model_lock:
+        model = _get_embedding_model()
+        if model is None:
+            return None
+        vector = model.encode(text, normalize_embeddings=True)
+
+    return array('f', (float(value) for value in vector)).tobytes()
+
+
+def _cosine_distance(embedding_a, embedding_b):
+    """
+    Compute the cosine distance between two normalized embeddings.
+
+    Args:
+        embedding_a (bytes): The first embedding as packed float32 values.
+        embedding_b (bytes): The second embedding as packed float32 values.
+
+    Returns:
+        float: The cosine distance between the embeddings.
+    """
+    vector_a, vector_b = array('f'), array('f')
+    vector_a.frombytes(embedding_a)
+    vector_b.frombytes(embedding_b)
+    return 1.0 - sum(a * b for a, b in zip(vector_a, vector_b))
+
+
+class ResponseCache:
+    """
+    A class to store ChatGPT responses keyed by the prompt and the image content.
+
+    The captions read from the images metadata are stored as well, keyed by the image file path,
+    modification time and size, so unchanged images are not parsed again on the next runs.
+
+    Re-running the processing over already described images reads the responses from the
+    cache instead of sending the same requests to the OpenAI API again. If the
+    'sentence-transformers' package is installed, the response cached for the same image with a
+    near-identical prompt can be looked up as well, see get_similar().
+
+    Methods:
+        image_key(image_file):
+            Static method. Hashes the content of the image file.
+
+        make_key(prompt, image_hash, image_caption=None):
+            Static method. Builds the cache key for a request.
+
+        get(key):
+            Returns the cached response for the key, or None if not available.
+
+        get_similar(key, prompt_text):
+            Returns the response cached for the same image with a similar prompt, or None.
+
+        put(key, value, prompt_text=None):
+            Stores the response for the key and the prompt embedding.
+
+        make_completion_key(prompt, image_hash, author_name=None):
+            Static method. Builds the key of an image written with the prompt metadata.
+
+        is_completed(key):
+            Returns True if the image was already written with the prompt metadata.
+
+        mark_completed(key):
+            Records that the image was written with the prompt metadata.
+
+        make_caption_key(image_path):
+            Static method. Builds the key of the image metadata caption.
+
+        get_caption(key):
+            Returns the cached image caption, '' if the image has none, or None if not available.
+
+        put_caption(key, caption):
+            Stores the image caption read from the image metadata.
+
+        close():
+            Closes the database connection.
+    """
+
+    def __init__(self, db_path=None, ttl=None):
+        """
+        Initialize the ResponseCache and create the database table if it doesn't exist.
+
+        Attributes:
+            db_path (str, optional): The path to the SQLite database file.
+                                     Defaults to 'responses.db' in the app data folder.
+            ttl (int, optional): The time in seconds after which a cached response expires.
+                                 Defaults to None (responses never expire).
+        """
+        self.db_path = db_path if db_path else get_data_file_path('responses.db')
+        self.ttl = ttl
+
+        # The connection is shared by the worker threads, serialize its use
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key BLOB PRIMARY KEY, response TEXT NOT NULL, created_at INTEGER NOT NULL)'
+            )
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS prompt_embeddings ('
+                'key BLOB PRIMARY KEY, image_hash BLOB NOT NULL, embedding BLOB NOT NULL)'
+            )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS prompt_embeddings_image_hash '
+                'ON prompt_embeddings (image_hash)'
+            )
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS completed_images ('
+                'key BLOB PRIMARY KEY, created_at INTEGER NOT NULL)'
+            )
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS image_captions ('
+                'key TEXT PRIMARY KEY, caption TEXT NOT NULL)'
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def image_key(image_file):
+        """
+        Hash the content of the image file.
+
+        The file is memory-mapped, so large images are hashed from the page cache without
+        being copied into memory. Images already loaded in memory are hashed in place.
+
+        Args:
+            image_file (file object): The image file opened in binary mode, or an io.BytesIO object.
+
+        Returns:
+            bytes: The hash of the image content.
+        """
+        if isinstance(image_file, io.BytesIO):
+            return hashlib.blake2b(image_file.getbuffer(), digest_size=16).digest()
+
+        try:
+            with mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as image_map:
+                return hashlib.blake2b(image_map, digest_size=16).digest()
+        except ValueError:
+            # Empty files cannot be memory-mapped
+            return hashlib.blake2b(b'', digest_size=16).digest()
+
+    @staticmethod
+    def make_key(prompt, image_hash, image_caption: Optional[str] = None):
+        """
+        Build the cache key for a request from the prompt, the image caption and the image content.
+
+        Args:
+            prompt (str): The prompt sent to the GPT model.
+            image_hash (bytes): The hash of the image content, see image_key().
+            image_caption (Optional[str]): The caption from image metadata, if available.
+
+        Returns:
+            bytes: The cache key.
+        """
+        prompt_hash = hashlib.sha256(f"{prompt}\0{image_caption or ''}".encode()).digest()
+        return prompt_hash + image_hash
+
+    def get(self, key):
+        """
+        Get the cached response stored for the exact key.
+
+        Args:
+            key (bytes): The cache key.
+
+        Returns:
+            dict or None: The cached response, or None if not found or expired.
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT response, created_at FROM responses WHERE key = ?', (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read the response cache: {e}")
+            return None
+
+        if row is None:
+            return None
+
+        response, created_at = row
+        if self.ttl is not None and time.time() - created_at > self.ttl:
+            return None
+
+        return json_loads(response)
+
+    def get_similar(self, key, prompt_text):
+        """
+        Get the response cached for the same image with the most similar prompt.
+
+        Small prompt edits can change the expected output, so only use it when the user
+        opted in to reusing the responses of similar prompts.
+
+        Args:
+            key (bytes): The cache key.
+            prompt_text (str): The full prompt text.
+
+        Returns:
+            dict or None: The cached response, or None if no prompt is similar enough.
+        """
+        embedding = _embed(prompt_text)
+        if embedding is None:
+            return None
+
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    'SELECT key, embedding FROM prompt_embeddings WHERE image_hash = ?',
+                    (key[PROMPT_HASH_SIZE:],),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read the response cache: {e}")
+            return None
+
+        best_distance, best_key = SIMILARITY_MAX_DISTANCE, None
+        for cached_key, cached_embedding in rows:
+            distance = _cosine_distance(embedding, cached_embedding)
+            if distance < best_distance:
+                best_distance, best_key = distance, cached_key
+
+        return self.get(best_key) if best_key is not None else None
+
+    def put(self, key, value, prompt_text=None):
+        """
+        Store the response for the key.
+
+        Args:
+            key (bytes): The cache key.
+            value (dict): The response to store.
+            prompt_text (Optional[str]): The full prompt text, to match similar prompts later.
+        """
+        embedding = _embed(prompt_text) if prompt_text else None
+
+        try:
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)',
+                    (key, json_dumps(value).decode(), int(time.time())),
+                )
+                if embedding is not None:
+                    self._conn.execute(
+                        'INSERT OR REPLACE INTO prompt_embeddings (key, image_hash, embedding) '
+                        'VALUES (?, ?, ?)',
+                        (key, key[PROMPT_HASH_SIZE:], embedding),
+                    )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write the response cache: {e}")
+
+    @staticmethod
+    def make_completion_key(prompt, image_hash, author_name: Optional[str] = None):
+        """
+        Build the key of an image written with the metadata generated for the prompt.
+
+        Args:
+            prompt (str): The prompt sent to the GPT model.
+            image_hash (bytes): The hash of the written image content, see image_key().
+            author_name (Optional[str]): The author name written to the image, if any.
+
+        Returns:
+            bytes: The completion key.
+        """
+        options_hash = hashlib.sha256(f"{prompt}\0{author_name or ''}".encode()).digest()
+        return options_hash + image_hash
+
+    def is_completed(self, key):
+        """
+        Check if the image was already written with the metadata generated for the prompt.
+
+        Args:
+            key (bytes): The completion key, see make_completion_key().
+
+        Returns:
+            bool: True if the image was already processed, False otherwise.
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT 1 FROM completed_images WHERE key = ?', (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read the response cache: {e}")
+            return False
+
+        return row is not None
+
+    def mark_completed(self, key):
+        """
+        Record that the image was written with the metadata generated for the prompt.
+
+        Args:
+            key (bytes): The completion key, see make_completion_key().
+        """
+        try:
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO completed_images (key, created_at) VALUES (?, ?)',
+                    (key, int(time.time())),
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write the response cache: {e}")
+
+    @staticmethod
+    def make_caption_key(image_path):
+        """
+        Build the key of the image metadata caption from the image file path, mtime and size.
+
+        A modified image gets a new key, so its caption is read again from the file.
+
+        Args:
+            image_path (str): Path to the image file.
+
+        Returns:
+            str: The caption key.
+        """
+        stat = os.stat(image_path)
+        return f"{os.path.realpath(image_path)}|{stat.st_mtime_ns}|{stat.st_size}"
+
+    def get_caption(self, key):
+        """
+        Get the cached caption of the image metadata.
+
+        Args:
+            key (str): The caption key, see make_caption_key().
+
+        Returns:
+            str or None: The cached caption, '' if the image has no caption, or None if not found.
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT caption FROM image_captions WHERE key = ?', (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read the response cache: {e}")
+            return None
+
+        return row[0] if row is not None else None
+
+    def put_caption(self, key, caption):
+        """
+        Store the caption read from the image metadata.
+
+        Args:
+            key (str): The caption key, see make_caption_key().
+            caption (Optional[str]): The caption of the image, None if the image has no caption.
+        """
+        try:
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO image_captions (key, caption) VALUES (?, ?)',
+                    (key, caption or ''),
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write the response cache: {e}")
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
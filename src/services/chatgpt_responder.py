@@ -1,19 +1,184 @@
 """This module describes images using OpenAI's GPT model."""
 
-import base64
+import functools
+import os
 from typing import Optional
 
 import requests
 import sys
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from src.data.path_manager import get_data_file_path
+from src.services.image_preprocessor import encode_image
+from src.services.json_codec import json_dumps, json_loads
 from src.services.logging_config import setup_logger
 
 # Initialize logger using the setup function
 logger = setup_logger(__name__)
 
 
-def process_photo(image_file, prompt, image_caption: Optional[str] = None):
+def _default_workers():
+    """
+    Compute the default number of images described concurrently from the CPUs allotted to the app.
+
+    The requests mostly wait on the network, so several requests are run per CPU, within bounds
+    to avoid running too many threads on large hosts.
+
+    Returns:
+        int: The default number of concurrent requests.
+    """
+    try:
+        cpu_count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        # The CPU affinity is not available on macOS and Windows
+        cpu_count = os.cpu_count() or 1
+    return min(32, max(4, cpu_count * 4))
+
+
+# Maximum number of images described concurrently, can be tuned with SVAI_WORKERS
+try:
+    MAX_CONCURRENT_REQUESTS = max(1, int(os.environ.get('SVAI_WORKERS', 0)) or _default_workers())
+except ValueError:
+    MAX_CONCURRENT_REQUESTS = _default_workers()
+
+# Retry the requests rejected by the rate limit or failed on the server side, with a backoff
+RETRY_POLICY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({'POST'}),
+    raise_on_status=False,
+)
+
+# Connect and read timeouts in seconds of the requests to the OpenAI API
+REQUEST_TIMEOUT = (10, 120)
+
+# Shared HTTP session to reuse the TLS connections to the OpenAI API between requests
+session = requests.Session()
+session.headers.update({'Content-Type': 'application/json'})
+session.mount(
+    'https://', HTTPAdapter(pool_maxsize=MAX_CONCURRENT_REQUESTS, max_retries=RETRY_POLICY)
+)
+
+# Placeholders of the per-image parts in the serialized request body
+TEXT_PLACEHOLDER = '__TEXT__'
+IMAGE_PLACEHOLDER = '__IMAGE__'
+
+
+class RequestTemplate:
+    """
+    A class to serialize the ChatGPT request body shared by all images described with a prompt.
+
+    The request body is serialized once for the prompt, only the image caption and the base64
+    image are added for each image, without serializing the large image string to JSON again.
+
+    Methods:
+        build_body(image_base64, image_caption=None):
+            Returns the serialized request body for an image.
+    """
+
+    def __init__(self, prompt):
+        """
+        Initialize the RequestTemplate and serialize the request body parts for the prompt.
+
+        Attributes:
+            prompt (str): The prompt to be sent to the GPT model for generating descriptions.
+        """
+        self.prompt = prompt
+
+        # Use GPT-4 by creating a prompt to generate a title, description, and keywords
+        payload = {
+            'model': 'gpt-4o',
+            'messages': [
+                {
+                    'role': 'user',
+                    'content': [
+                        {'type': 'text', 'text': TEXT_PLACEHOLDER},
+                        {
+                            'type': 'image_url',
+                            'image_url': {'url': f"data:image/jpeg;base64,{IMAGE_PLACEHOLDER}"},
+                        },
+                    ],
+                }
+            ],
+            'max_tokens': 300,
+        }
+        # Split the serialized payload around the placeholders, keeping the parts as bytes
+        self._head, rest = json_dumps(payload).split(TEXT_PLACEHOLDER.encode())
+        self._middle, self._tail = rest.split(IMAGE_PLACEHOLDER.encode())
+        self._prompt = json_dumps(prompt)[1:-1]
+
+    def build_body(self, image_base64, image_caption: Optional[str] = None):
+        """
+        Build the serialized request body for an image.
+
+        Args:
+            image_base64 (bytes): The base64 encoded image.
+            image_caption (Optional[str]): The caption from image metadata, if available.
+
+        Returns:
+            bytes: The JSON request body.
+        """
+        # Create a general prompt for ChatGPT
+        if image_caption:
+            context = f". Use the following context to enhance your response: {image_caption}"
+            context = json_dumps(context)[1:-1]
+        else:
+            context = b''
+
+        return b''.join((self._head, self._prompt, context, self._middle, image_base64, self._tail))
+
+
+def get_api_key():
+    """
+    Get the OpenAI API key from the OPENAI_API_KEY environment variable or the app settings.
+
+    The key file is parsed again only after it was modified, the concurrent requests share
+    the parsed key otherwise.
+
+    Returns:
+        str: The OpenAI API key.
+
+    Raises:
+        FileNotFoundError: If the key file does not exist.
+        ValueError: If the key file holds no key.
+    """
+    # The key set in the environment takes precedence over the saved one
+    api_key = os.environ.get('OPENAI_API_KEY', '').strip()
+    if api_key:
+        return api_key
+
+    key_file_path = get_data_file_path('openai_key.txt')
+    return _read_api_key(key_file_path, os.stat(key_file_path).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=1)
+def _read_api_key(key_file_path, mtime_ns):
+    """
+    Read the OpenAI API key from the key file.
+
+    Args:
+        key_file_path (str): The path to the key file.
+        mtime_ns (int): The modification time of the key file, to read the file again on change.
+
+    Returns:
+        str: The OpenAI API key.
+    """
+    with open(key_file_path, 'r') as f:
+        line = f.readline()
+        api_key = line.partition('; ')[2].strip()
+    if not api_key:
+        raise ValueError("OpenAI API Key is missing")
+    return api_key
+
+
+def process_photo(
+    image_file,
+    prompt,
+    image_caption: Optional[str] = None,
+    request_template: Optional[RequestTemplate] = None,
+):
     """
     Process a given photo to generate a title, description, and keywords with ChatGPT-4.
 
@@ -21,15 +186,15 @@ def process_photo(image_file, prompt, image_caption: Optional[str] = None):
         image_file (file object): The image file to be processed.
         prompt (str): The prompt to be sent to the GPT model for generating descriptions.
         image_caption (Optional[str]): The caption from image metadata, if available.
+        request_template (Optional[RequestTemplate]): The request body prepared for the prompt.
+                                                      Built from the prompt if not provided.
 
     Returns:
          dict: A JSON object containing the generated title, description, and keywords.
     """
     # Set your OpenAI API key
     try:
-        with open(get_data_file_path('openai_key.txt'), 'r') as f:
-            line = f.read()
-            API_KEY = line.split('; ')[1].strip()
+        API_KEY = get_api_key()
     except FileNotFoundError as e:
         logger.critical(
             f"Could not find {e.filename}. Please ensure the file exists and is accessible."
@@ -41,42 +206,20 @@ def process_photo(image_file, prompt, image_caption: Optional[str] = None):
         # Exit the program with a status code 1
         sys.exit(1)
 
-    # Convert the image to a based64 string
-    image_base64 = base64.b64encode(image_file.read()).decode('ascii')
+    # Downscale the image and encode it to base64
+    image_base64 = encode_image(image_file)
 
-    # Create a general prompt for ChatGPT
-    if image_caption:
-        gen_prompt = (
-            f"{prompt}. Use the following context to enhance your response: {image_caption}"
-        )
-    else:
-        gen_prompt = prompt
-
-    # Use GPT-4 by creating a prompt to generate a title, description, and keywords
-    payload = {
-        'model': 'gpt-4o',
-        'messages': [
-            {
-                'role': 'user',
-                'content': [
-                    {'type': 'text', 'text': gen_prompt},
-                    {
-                        'type': 'image_url',
-                        'image_url': {'url': f"data:image/jpeg;base64,{image_base64}"},
-                    },
-                ],
-            }
-        ],
-        'max_tokens': 300,
-    }
-
-    response = requests.post(
+    # Serialize the request body from the prompt template
+    if request_template is None:
+        request_template = RequestTemplate(prompt)
+    body = request_template.build_body(image_base64, image_caption)
+
+    response = session.post(
         url="https://api.openai.com/v1/chat/completions",
-        headers={
-            'Content-Type': 'application/json',
-            'Authorization': f"Bearer {API_KEY}",
-        },
-        json=payload,
-    ).json()
-
-    return response
+        headers={'Authorization': f"Bearer {API_KEY}"},
+        data=body,
+        timeout=REQUEST_TIMEOUT,
+    )
+
+    # Decode the response body bytes directly
+    return json_loads(response.content)
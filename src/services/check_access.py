@@ -4,31 +4,130 @@ import os.path
 import platform
 import subprocess
 import time
+from collections import defaultdict
 
-import psutil
-
+from src.services.exiftool_pipe import exiftool
 from src.services.logging_config import setup_logger
 
 # Initialize logger using the setup function
 logger = setup_logger(__name__)
 
 
+def _import_psutil():
+    """
+    Import psutil on demand, it is only needed when a file is locked or on Windows.
+
+    Returns:
+        module: The psutil module.
+    """
+    import psutil
+
+    return psutil
+
+
 def normalize_path(filepath):
     """Normalize the file path for consistent comparison."""
-    return os.path.normcase(os.path.abspath(filepath))
+    return os.path.normcase(os.path.realpath(filepath))
+
+
+def get_open_files_index(folder_paths):
+    """
+    Get the processes using the files of folders, with a single scan of the processes.
+
+    Checking each image separately scans all the processes once per image, the index is built
+    once for the folders and looked up for each image instead.
+
+    Attributes:
+        folder_paths: Paths to the folders of the files to check.
+
+    Returns:
+        Dict of normalized file paths to the list of process details with 'pid' and 'name'.
+    """
+    if platform.system() == 'Darwin':  # macOS
+        return get_open_files_index_mac(folder_paths)
+    elif platform.system() == 'Windows':
+        return get_open_files_index_windows()
+    else:
+        logger.error("Unsupported operating system.")
+        return {}
+
+
+def get_open_files_index_mac(folder_paths):
+    """
+    Get the processes using the files of folders with a single 'lsof' run on macOS.
 
+    Attributes:
+        folder_paths: Paths to the folders of the files to check.
+
+    Returns:
+        Dict of normalized file paths to the list of process details with 'pid' and 'name'.
+    """
+    index = defaultdict(list)
+    try:
+        # List the process ID, command name and file name fields of the files open in the folders
+        command = ['lsof', '-F', 'pcn']
+        for folder_path in folder_paths:
+            command += ['+D', folder_path]
+        result = subprocess.check_output(command, text=True)
+    except subprocess.CalledProcessError as e:
+        # Check the return code for no processes found using the files
+        if e.returncode == 1:
+            logger.debug(f"No processes found using the files in {', '.join(folder_paths)}.")
+        else:
+            logger.error(f"Failed to check processes using the files: {e}")
+        return index
+
+    pid, process_name = None, None
+    for line in result.splitlines():
+        field, value = line[:1], line[1:]
+        if field == 'p':
+            pid = int(value)
+        elif field == 'c':
+            process_name = value
+        elif field == 'n':
+            index[normalize_path(value)].append({'pid': pid, 'name': process_name})
+    return index
+
+
+def get_open_files_index_windows():
+    """
+    Get the processes using files with a single scan of the processes on Windows using 'psutil'.
+
+    Returns:
+        Dict of normalized file paths to the list of process details with 'pid' and 'name'.
+    """
+    psutil = _import_psutil()
 
-def terminate_processes_using_file(filepath):
+    index = defaultdict(list)
+    for proc in psutil.process_iter(['pid', 'name', 'open_files']):
+        try:
+            for file in proc.info['open_files'] or []:
+                index[normalize_path(file.path)].append(
+                    {'pid': proc.info['pid'], 'name': proc.info['name']}
+                )
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return index
+
+
+def terminate_processes_using_file(filepath, open_files_index=None):
     """
     Terminate all processes that are using a specific file.
 
+    The application itself and its ExifTool process are never terminated.
+
     Attributes:
         filepath: Path to the file to check and terminate processes for.
+        open_files_index: The open files of the folders, see get_open_files_index(). The file
+                          is removed from it once its processes are terminated. The processes
+                          are scanned for the file if not provided.
     """
     # Get normalized path
     normalized_path = normalize_path(filepath)
 
-    if platform.system() == 'Darwin':  # macOS
+    if open_files_index is not None:
+        processes = open_files_index.pop(normalized_path, None)
+    elif platform.system() == 'Darwin':  # macOS
         processes = get_processes_using_file_mac(normalized_path)
     elif platform.system() == 'Windows':
         processes = get_processes_using_file_windows(normalized_path)
@@ -36,8 +135,13 @@ def terminate_processes_using_file(filepath):
         logger.error("Unsupported operating system.")
         return
 
+    # Keep the processes of the application, which may read the file themselves
+    own_pids = {os.getpid(), exiftool.pid}
+
     if processes:
         for proc in processes:
+            if proc['pid'] in own_pids:
+                continue
             terminate_process(proc['pid'])
             time.sleep(1)  # wait to ensure the process is terminated
 
@@ -81,6 +185,8 @@ def get_processes_using_file_windows(filepath):
     Returns:
         List of process details with 'pid' and 'name'.
     """
+    psutil = _import_psutil()
+
     processes = []
     for proc in psutil.process_iter(['pid', 'name', 'open_files']):
         try:
@@ -99,6 +205,8 @@ def terminate_process(pid):
     Attributes:
         pid: Process ID (PID) of the process to terminate.
     """
+    psutil = _import_psutil()
+
     try:
         process = psutil.Process(pid)
         process.terminate()  # send a terminate signal
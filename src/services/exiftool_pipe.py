@@ -0,0 +1,121 @@
+"""Module to run ExifTool commands through a single long-running process."""
+
+import atexit
+import os
+import subprocess
+import threading
+
+from src.services.logging_config import setup_logger
+
+# Initialize logger using the setup function
+logger = setup_logger(__name__)
+
+
+class ExifToolPipe:
+    """
+    A class to run ExifTool commands in a single process using its '-stay_open' batch mode.
+
+    Starting ExifTool loads the Perl interpreter and its modules, which takes longer than reading
+    the metadata of an image. The process is started once and receives the commands on its
+    standard input, so this cost is paid once per session instead of once per image.
+
+    Methods:
+        execute(*args):
+            Runs an ExifTool command and returns its output.
+
+        close():
+            Stops the ExifTool process.
+
+        pid:
+            Property. The process ID of the running ExifTool process, or None.
+    """
+
+    def __init__(self, executable='exiftool'):
+        """
+        Initialize the ExifToolPipe, the process is started on the first command.
+
+        Attributes:
+            executable (str, optional): The ExifTool executable. Defaults to 'exiftool'.
+        """
+        self.executable = executable
+        self._process = None
+        self._command_id = 0
+
+        # The commands of the worker threads are sent to the process one at a time
+        self._lock = threading.Lock()
+
+    @property
+    def pid(self):
+        """
+        Get the process ID of the ExifTool process.
+
+        Returns:
+            int or None: The process ID, or None if the process is not running.
+        """
+        process = self._process
+        if process is None or process.poll() is not None:
+            return None
+        return process.pid
+
+    def _start(self):
+        """Start the ExifTool process reading the commands from its standard input."""
+        self._process = subprocess.Popen(
+            [self.executable, '-stay_open', 'True', '-@', '-'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def execute(self, *args):
+        """
+        Run an ExifTool command and return its output.
+
+        Attributes:
+            *args (str): The command line arguments of the command, one argument per value.
+
+        Returns:
+            str: The command output.
+        """
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._start()
+
+            # Number the commands to recognize the end of each command output
+            self._command_id += 1
+            ready = f"{{ready{self._command_id}}}".encode()
+
+            command_args = ('-charset', 'filename=utf8', *args, f"-execute{self._command_id}")
+            self._process.stdin.write(''.join(f"{arg}\n" for arg in command_args).encode())
+            self._process.stdin.flush()
+
+            # Read the output until the ready message of the command
+            output = bytearray()
+            stdout_fd = self._process.stdout.fileno()
+            while ready not in output:
+                chunk = os.read(stdout_fd, 65536)
+                if not chunk:
+                    raise RuntimeError("ExifTool process exited unexpectedly.")
+                output += chunk
+
+            return output[: output.rindex(ready)].decode('utf-8', errors='replace')
+
+    def close(self):
+        """Stop the ExifTool process, if it is running."""
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                return
+
+            try:
+                self._process.stdin.write(b'-stay_open\nFalse\n')
+                self._process.stdin.flush()
+                self._process.wait(timeout=5)
+            except Exception as e:
+                logger.error(f"Failed to stop ExifTool: {e}")
+                self._process.kill()
+            finally:
+                self._process = None
+
+
+# Shared ExifTool process, stopped on the application exit
+exiftool = ExifToolPipe()
+atexit.register(exiftool.close)
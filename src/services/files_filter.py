@@ -12,6 +12,11 @@ from src.services.logging_config import setup_logger
 # Initialize logger using the setup function
 logger = setup_logger(__name__)
 
+# Extensions of the files recognized as images
+IMAGE_EXTENSIONS = frozenset(
+    {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff', '.ico', '.svg'}
+)
+
 
 def filter_files_by_extension(src_path):
     """
@@ -21,14 +26,15 @@ def filter_files_by_extension(src_path):
         src_path (str): Path to source directory.
 
     Returns:
-        List of filtered image file names.
+        List of (name, path, size) tuples of the filtered image files.
     """
-    # Check if any file exists in source folder
-    src_fld_files = [
-        f
-        for f in os.listdir(src_path)
-        if os.path.isfile(os.path.join(src_path, f)) and not f.startswith('.')  # skip hidden files
-    ]
+    # Check if any file exists in source folder, in a single pass reusing the cached entry type
+    with os.scandir(src_path) as entries:
+        src_fld_files = [
+            (entry.name, entry.path, entry.stat().st_size)
+            for entry in entries
+            if entry.is_file() and not entry.name.startswith('.')  # skip hidden files
+        ]
     if not src_fld_files:
         logger.warning(
             f"No files found in the source folder '{src_path}' to process.\n"
@@ -39,26 +45,24 @@ def filter_files_by_extension(src_path):
 
     logger.info("Starting to filter files by image types in the source folder.")
 
-    image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff', '.ico', '.svg'}
     filtered_files = []
 
-    for image_name in src_fld_files:
-        image_path = os.path.join(src_path, image_name)
-
-        # Check if the file is an image based on its extension
-        if image_name.lower().endswith(tuple(image_extensions)) and os.path.isfile(image_path):
+    for image_name, image_path, image_size in src_fld_files:
+        # Check if the file is an image based on its lowercased extension
+        image_ext = os.path.splitext(image_name)[1].lower()
+        if image_ext in IMAGE_EXTENSIONS:
             with Image.open(image_path) as img:
                 # Verify image integrity
                 img.verify()
 
                 # Ensure that only JPEG files are processed
                 if isinstance(img, JpegImagePlugin.JpegImageFile):
-                    filtered_files.append(image_name)
+                    filtered_files.append((image_name, image_path, image_size))
 
                 # Other image formats - leave file without modification
                 else:
                     logger.warning(
-                        f"Unsupported image format ({str(image_name).upper().split('.')[-1]}), "
+                        f"Unsupported image format ({image_ext[1:].upper()}), "
                         f"the file '{image_name}' was left in the source folder unprocessed."
                     )
         else:
@@ -0,0 +1,135 @@
+"""This module prepares images to be sent to the GPT model."""
+
+import base64
+import io
+import math
+import mmap
+import os
+
+from PIL import Image, ImageOps
+
+from src.services.logging_config import setup_logger
+
+# Initialize logger using the setup function
+logger = setup_logger(__name__)
+
+# The GPT model scales images to fit 2048x2048 and then to 768px on the shortest side
+MAX_LONG_SIDE = 2048
+MAX_SHORT_SIDE = 768
+
+# Quality of the downscaled JPEG images sent to the GPT model
+JPEG_QUALITY = 85
+
+# Largest read buffer used for the image files
+MAX_READ_BUFFER = 1 << 20
+
+# Largest image file loaded in memory at once, larger files are read from the disk
+MAX_IN_MEMORY_SIZE = 32 << 20
+
+
+def open_image(image_path, image_size=None):
+    """
+    Open the image file for reading, with a read buffer sized to the file.
+
+    The default 8 KiB buffer splits the reads of multi-megabyte images into many system calls,
+    the buffer grows with the file size up to 1 MiB instead.
+
+    Args:
+        image_path (str): The path to the image file.
+        image_size (int, optional): The size of the image file, if already known.
+
+    Returns:
+        file object: The image file opened in binary mode.
+    """
+    if image_size is None:
+        image_size = os.path.getsize(image_path)
+    buffering = min(max(image_size, io.DEFAULT_BUFFER_SIZE), MAX_READ_BUFFER)
+    return open(image_path, 'rb', buffering=buffering)
+
+
+def load_image(image_path, image_size=None):
+    """
+    Load the image file content in memory with a single read, to be shared by all its readers.
+
+    Files larger than 32 MB are opened for streaming reads instead.
+
+    Args:
+        image_path (str): The path to the image file.
+        image_size (int, optional): The size of the image file, if already known.
+
+    Returns:
+        file object: The image content as an io.BytesIO object, or the image file opened in binary mode.
+    """
+    if image_size is None:
+        image_size = os.path.getsize(image_path)
+    if image_size > MAX_IN_MEMORY_SIZE:
+        return open_image(image_path, image_size)
+
+    with open(image_path, 'rb', buffering=0) as image_file:
+        return io.BytesIO(image_file.read())
+
+
+def encode_image(image_file):
+    """
+    Downscale the image to the size used by the GPT model and encode it to base64.
+
+    The image content is read in place, from the in-memory buffer or from a memory map of the
+    file, so it is never copied before being encoded.
+
+    Args:
+        image_file (file object): The image file to be encoded, or an io.BytesIO object.
+
+    Returns:
+        bytes: The base64 encoded JPEG image.
+    """
+    if isinstance(image_file, io.BytesIO):
+        image_file.seek(0)
+        with image_file.getbuffer() as image_view:
+            return _encode_image_view(image_file, image_view)
+
+    try:
+        image_map = mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError, io.UnsupportedOperation):
+        # Empty files and file objects without a file descriptor cannot be memory-mapped
+        return encode_image(io.BytesIO(image_file.read()))
+
+    with image_map:
+        return _encode_image_view(image_map, image_map)
+
+
+def _encode_image_view(image_source, image_view):
+    """
+    Downscale the image content to the size used by the GPT model and encode it to base64.
+
+    Images already small enough are sent unchanged. Large JPEG images are decoded at a reduced
+    scale, which is much faster than decoding the full image and resizing it.
+
+    Args:
+        image_source (file object): The seekable image content read by the image decoder.
+        image_view (memoryview or mmap.mmap): The buffer of the same image content.
+
+    Returns:
+        bytes: The base64 encoded JPEG image.
+    """
+    try:
+        with Image.open(image_source) as image:
+            width, height = image.size
+            scale = min(MAX_LONG_SIDE / max(width, height), MAX_SHORT_SIDE / min(width, height))
+            if scale >= 1 and image.format == 'JPEG':
+                return base64.b64encode(image_view)
+
+            # Let the JPEG decoder skip the detail that would be lost by resizing
+            size = (math.ceil(width * min(scale, 1)), math.ceil(height * min(scale, 1)))
+            image.draft('RGB', size)
+            image.thumbnail(size, Image.LANCZOS)
+
+            # Apply the EXIF orientation, as it is not kept in the re-encoded image
+            image = ImageOps.exif_transpose(image).convert('RGB')
+
+            buffer = io.BytesIO()
+            image.save(buffer, format='JPEG', quality=JPEG_QUALITY)
+            return base64.b64encode(buffer.getvalue())
+    except Exception as e:
+        logger.error(f"Failed to downscale the image, sending the original. Error: {e}")
+
+    return base64.b64encode(image_view)
@@ -1,31 +1,135 @@
 """Module to read IPTC, XMP, and EXIF metadata from images."""
 
+import io
 import json
 import re
-import subprocess
-
-from iptcinfo3 import IPTCInfo
+import struct
 
+from src.services.exiftool_pipe import exiftool
 from src.services.logging_config import setup_logger
 
 # Initialize logger
 logger = setup_logger(__name__)
 
+# Default language description of the XMP metadata, XML escapes its text so it holds no '<'
+XMP_DESCRIPTION_PATTERN = re.compile(r"<rdf:li\s+xml:lang=['\"]x-default['\"]>([^<]*)</rdf:li>")
+
+# Signatures of the JPEG APP13 segment holding the IPTC metadata and APP1 segment holding the XMP
+IPTC_SEGMENT = (0xED, b'Photoshop 3.0\0')
+XMP_SEGMENT = (0xE1, b'http://ns.adobe.com/xap/1.0/\0')
 
-def get_metadata(image_path):
+
+def get_metadata(image_path, image_file=None, cache=None, iptc_info=None):
     """
     Get image metadata description from IPTC or XMP.
 
     Attributes:
         image_path (str): Path to the image file.
+        image_file (io.BytesIO, optional): The image content already loaded in memory, to read the
+                                           IPTC metadata without opening the file again.
+        cache (ResponseCache, optional): The cache of the captions read from unchanged images.
+        iptc_info (IPTCInfo, optional): The IPTC metadata already read from the image, to avoid
+                                        parsing it again.
 
     Returns:
         str or None: Image description string, if available.
     """
-    iptc_description = read_iptc_data(image_path)
-    xmp_description = read_xmp_data(image_path)
+    # Reuse the caption read on a previous run if the image has not changed since
+    if cache is not None:
+        caption_key = cache.make_caption_key(image_path)
+        caption = cache.get_caption(caption_key)
+        if caption is not None:
+            return caption or None
+
+    caption = _read_metadata(image_path, image_file, iptc_info)
 
-    return iptc_description or xmp_description
+    if cache is not None:
+        cache.put_caption(caption_key, caption)
+    return caption
+
+
+def _read_metadata(image_path, image_file=None, iptc_info=None):
+    """
+    Read image metadata description from IPTC or XMP in the image file.
+
+    Attributes:
+        image_path (str): Path to the image file.
+        image_file (io.BytesIO, optional): The image content already loaded in memory.
+        iptc_info (IPTCInfo, optional): The IPTC metadata already read from the image.
+
+    Returns:
+        str or None: Image description string, if available.
+    """
+    # Find the metadata segments from the JPEG headers, to skip the readers of missing metadata
+    if isinstance(image_file, io.BytesIO):
+        has_iptc, has_xmp = find_metadata_segments(image_file)
+    else:
+        with open(image_path, 'rb') as headers_file:
+            has_iptc, has_xmp = find_metadata_segments(headers_file)
+
+    # Take the caption from the IPTC metadata already read, or read it if the segment exists
+    if iptc_info is not None:
+        caption = iptc_info['caption/abstract']
+    elif has_iptc:
+        # The IPTC reader closes the file object it reads, give it its own view of the content
+        if isinstance(image_file, io.BytesIO):
+            caption = read_iptc_data(io.BytesIO(image_file.getvalue()))
+        else:
+            caption = read_iptc_data(image_path)
+    else:
+        caption = None
+
+    # Read the XMP metadata only if the IPTC metadata has no description
+    if not caption and has_xmp:
+        caption = read_xmp_data(image_path)
+    return caption
+
+
+def find_metadata_segments(image_file):
+    """
+    Check which metadata segments the JPEG image holds, reading only the segment headers.
+
+    The IPTC and XMP readers parse the whole image or run ExifTool, most images exported
+    without metadata are recognized from their headers instead.
+
+    Attributes:
+        image_file (file object): The image file opened in binary mode, or an io.BytesIO object.
+
+    Returns:
+        tuple: (has_iptc, has_xmp) flags, both True if the headers could not be parsed.
+    """
+    has_iptc, has_xmp = False, False
+    signature_size = max(len(IPTC_SEGMENT[1]), len(XMP_SEGMENT[1]))
+    position = image_file.tell()
+    try:
+        image_file.seek(0)
+        if image_file.read(2) != b'\xff\xd8':
+            # Not a JPEG image, let the readers handle it
+            return True, True
+
+        while True:
+            header = image_file.read(4)
+            if len(header) < 4 or header[0] != 0xFF:
+                return True, True
+            marker, segment_size = header[1], struct.unpack('>H', header[2:])[0]
+
+            # The image data starts, no metadata segment follows
+            if marker in (0xDA, 0xD9):
+                return has_iptc, has_xmp
+
+            signature = image_file.read(min(signature_size, segment_size - 2))
+            if marker == IPTC_SEGMENT[0] and signature.startswith(IPTC_SEGMENT[1]):
+                has_iptc = True
+            elif marker == XMP_SEGMENT[0] and signature.startswith(XMP_SEGMENT[1]):
+                has_xmp = True
+
+            # Skip the rest of the segment
+            image_file.seek(segment_size - 2 - len(signature), io.SEEK_CUR)
+    except (OSError, struct.error) as e:
+        logger.debug(f"Failed to read the JPEG segments, reading all metadata. Error: {e}")
+        return True, True
+    finally:
+        image_file.seek(position)
 
 
 def read_iptc_data(image_path):
@@ -33,11 +137,14 @@ def read_iptc_data(image_path):
     Read IPTC metadata from the image.
 
     Attributes:
-        image_path (str): Path to the image file.
+        image_path (str or file object): Path to the image file, or the image file object.
 
     Returns:
         str or None: IPTC caption/abstract if found.
     """
+    # Import on demand, the IPTC reader is only needed for the images holding IPTC metadata
+    from iptcinfo3 import IPTCInfo
+
     try:
         info = IPTCInfo(image_path)
         return info['caption/abstract']
@@ -57,19 +164,9 @@ def read_xmp_data(image_path):
         str or None: XMP description if available.
     """
     try:
-        result = subprocess.run(
-            ['exiftool', '-b', '-XMP', image_path],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        xmp_data = result.stdout.strip()
-
-        match = re.search(
-            r"<rdf:li\s+xml:lang=['\"]x-default['\"]>(.*?)</rdf:li>",
-            xmp_data,
-            re.DOTALL,
-        )
+        xmp_data = exiftool.execute('-b', '-XMP', image_path).strip()
+
+        match = XMP_DESCRIPTION_PATTERN.search(xmp_data)
 
         if match:
             return match.group(1).strip()
@@ -91,13 +188,7 @@ def read_exif_data(image_path):
         dict or None: EXIF metadata if found, otherwise None.
     """
     try:
-        result = subprocess.run(
-            ['exiftool', '-EXIF', '-json', image_path],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        return json.loads(result.stdout)[0]
+        return json.loads(exiftool.execute('-EXIF', '-json', image_path))[0]
     except Exception as e:
         logger.error(f"No EXIF metadata found. Error: {e}")
         return None
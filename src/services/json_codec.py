@@ -0,0 +1,38 @@
+"""Module to encode and decode JSON with orjson, falling back to the standard library."""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data):
+    """
+    Deserialize a JSON document.
+
+    Attributes:
+        data (bytes or str): The JSON document, bytes are decoded without an intermediate str.
+
+    Returns:
+        object: The deserialized document.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj):
+    """
+    Serialize an object to a JSON document.
+
+    Attributes:
+        obj (object): The object to serialize.
+
+    Returns:
+        bytes: The UTF-8 encoded JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode()
@@ -1,10 +1,13 @@
 """Provides centralized logging configuration for Python applications."""
 
 import logging
-import tkinter as tk
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 from colorlog import ColoredFormatter
 
+from src.data.path_manager import get_data_file_path
+
 # Suppress INFO and WARNING from iptcinfo3
 logging.getLogger('iptcinfo').setLevel(logging.ERROR)
 
@@ -24,11 +27,31 @@ detailed_formatter = ColoredFormatter(
     log_colors=log_colors,
 )
 
+# Plain formatter for the log file
+file_formatter = logging.Formatter(
+    '%(module)s.%(funcName)s:%(lineno)d >>> %(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%d/%m/%Y %H:%M:%S',
+)
+
+# Listener writing the queued log records to the handlers, started by configure_logging()
+_log_listener = None
+
+# Maximum number of log records waiting to be displayed in the Text widget
+MAX_QUEUED_RECORDS = 2000
+
+# Maximum number of log records inserted into the Text widget per drain
+MAX_DRAIN_RECORDS = 500
+
+# Maximum number of lines kept in the Text widget and number of oldest lines removed at once
+MAX_LOG_LINES = 2000
+TRIM_CHUNK = 500
+
 
 def setup_logger(logger_name):
     """
-    Set up a logger instance with the specified name using the configured ColoredFormatter and
-    writes all logs to a file.
+    Set up a logger instance with the specified name.
+
+    The records propagate to the root logger, configured once by configure_logging().
 
     Attributes:
         logger_name (str): The name of the logger instance.
@@ -38,50 +61,175 @@ def setup_logger(logger_name):
     """
     logger = logging.getLogger(logger_name)
     logger.setLevel(logging.INFO)
+    return logger
 
-    if logger_name == 'root':
-        # Stream handler for console
-        stream_handler = logging.StreamHandler()
-        stream_handler.setFormatter(detailed_formatter)
-        logger.addHandler(stream_handler)
 
-    return logger
+def configure_logging():
+    """
+    Configure the root logger to write all logs to the console and a file from a background thread.
+
+    The logging threads only put the records on a queue, a single QueueListener formats and writes
+    them, so logging never waits for the console or the disk. Calling it again has no effect.
+
+    Returns:
+        logging.handlers.QueueListener: The started listener, to be stopped on the app exit.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return _log_listener
+
+    # Stream handler for console
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(detailed_formatter)
+
+    # File handler for the application log, opened on the first record
+    file_handler = logging.FileHandler(get_data_file_path('app.log'), encoding='utf-8', delay=True)
+    file_handler.setFormatter(file_formatter)
+
+    log_queue = queue.SimpleQueue()
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(QueueHandler(log_queue))
+
+    _log_listener = QueueListener(log_queue, stream_handler, file_handler)
+    _log_listener.start()
+    return _log_listener
+
+
+def add_log_handler(handler):
+    """
+    Add a handler to the log records listener.
+
+    Attributes:
+        handler (logging.Handler): The handler to add.
+    """
+    if _log_listener is not None and handler not in _log_listener.handlers:
+        _log_listener.handlers = _log_listener.handlers + (handler,)
+
+
+def remove_log_handler(handler):
+    """
+    Remove a handler from the log records listener.
+
+    Attributes:
+        handler (logging.Handler): The handler to remove.
+    """
+    if _log_listener is not None:
+        _log_listener.handlers = tuple(h for h in _log_listener.handlers if h is not handler)
 
 
-class TextHandler(logging.Handler):
+def _level_tag(levelno):
+    """
+    Get the Text widget color tag of the log level.
+
+    Custom levels are displayed with the tag of the nearest lower standard level.
+
+    Attributes:
+        levelno (int): The numeric log level of the record.
+
+    Returns:
+        str: The name of the color tag.
+    """
+    if levelno >= logging.CRITICAL:
+        return 'CRITICAL'
+    if levelno >= logging.ERROR:
+        return 'ERROR'
+    if levelno >= logging.WARNING:
+        return 'WARNING'
+    if levelno >= logging.INFO:
+        return 'INFO'
+    return 'DEBUG'
+
+
+class TextHandler(QueueHandler):
     """
     A custom logging handler that directs log messages to a Tkinter Text widget, allowing
     real-time log display in a GUI application.
+
+    Log records are formatted and put on a bounded queue by the emitting thread, then
+    inserted into the widget from the Tkinter main loop, so background threads never call
+    Tkinter directly and never wait for the GUI.
     """
 
-    def __init__(self, text_widget):
+    def __init__(self, text_widget, poll_interval=50):
         """
         Initialize the TextHandler with a Tkinter Text widget.
 
         Attributes:
             text_widget (tk.Text): The Tkinter widget that displays log messages.
+            poll_interval (int, optional): The log queue polling interval in milliseconds.
+                                           Defaults to 50.
         """
 
-        super().__init__()
+        super().__init__(queue.Queue(maxsize=MAX_QUEUED_RECORDS))
         self.text_widget = text_widget  # Store reference to the Text widget
+        self.poll_interval = poll_interval
 
-    def emit(self, record):
+        # Start draining the log queue on the main thread
+        self.text_widget.after(self.poll_interval, self._drain_log_queue)
+
+    def enqueue(self, record):
         """
-        Formats and appends a log record to the associated Tkinter Text widget.
+        Queue a formatted log record without blocking the emitting thread.
+
+        If the queue is full, DEBUG records are dropped, otherwise the oldest queued record
+        is discarded to make room for the new one.
 
         Attributes:
-            record (logging.LogRecord): A LogRecord instance containing the event data.
+            record (logging.LogRecord): A formatted LogRecord instance.
         """
-        msg = self.format(record)
-        log_level = record.levelname  # Retrieve log level for tag-based coloring
-
-        def append():
-            # Check if widget still exists to avoid TclError if closed
-            if self.text_widget.winfo_exists():
-                self.text_widget.configure(state='normal')  # Enable editing to insert text
-                self.text_widget.insert(tk.END, msg + '\n', log_level)  # Insert with color tag
-                self.text_widget.configure(state='disabled')  # Re-disable editing
-                self.text_widget.yview(tk.END)  # Auto-scroll to latest entry
-
-        # Schedule append() on the main thread to ensure thread safety
-        self.text_widget.after(2500, append)
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno <= logging.DEBUG:
+                return
+
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+
+    def _drain_log_queue(self):
+        """Append all queued log messages to the Text widget and schedule the next drain."""
+        # Check if widget still exists to avoid TclError if closed
+        if not self.text_widget.winfo_exists():
+            return
+
+        # Group consecutive messages of the same log level into (text, tag) chunks
+        chunks = []
+        for _ in range(MAX_DRAIN_RECORDS):
+            try:
+                record = self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+            msg = record.msg  # Message formatted by the emitting thread
+            log_level = _level_tag(record.levelno)  # Tag for color coding
+
+            if chunks and chunks[-1][1] == log_level:
+                chunks[-1][0].append(msg)
+            else:
+                chunks.append(([msg], log_level))
+
+        if chunks:
+            # Insert all chunks with their color tags in a single call
+            insert_args = []
+            for messages, log_level in chunks:
+                insert_args.extend(('\n'.join(messages) + '\n', log_level))
+
+            self.text_widget.configure(state='normal')  # Enable editing to insert text
+            self.text_widget.insert('end', *insert_args)  # Insert with color tags
+
+            # Remove the oldest lines to keep the widget size bounded
+            line_count = int(self.text_widget.index('end-1c').split('.')[0])
+            if line_count > MAX_LOG_LINES:
+                trim_to = line_count - MAX_LOG_LINES + TRIM_CHUNK
+                self.text_widget.delete('1.0', f'{trim_to}.0')
+
+            self.text_widget.configure(state='disabled')  # Re-disable editing
+            self.text_widget.yview('end')  # Auto-scroll to latest entry
+
+        # Drain again right away if records are still pending
+        delay = 0 if not self.queue.empty() else self.poll_interval
+        self.text_widget.after(delay, self._drain_log_queue)
@@ -6,21 +6,25 @@ from src.services.logging_config import setup_logger
 logger = setup_logger(__name__)
 
 
-def execution_timer(processed_count, unprocessed_count, process_time):
+def execution_timer(processed_count, unprocessed_count, process_time, skipped_count=0):
     """
-    Log the processing time and count of processed and unprocessed images.
+    Log the processing time and count of processed, unprocessed, and skipped images.
 
     Attributes:
         processed_count (int): The number of images successfully processed.
         unprocessed_count (int): The number of images that were not processed.
         process_time (float): The total time taken to process the images, in seconds.
+        skipped_count (int, optional): The number of images skipped as already processed.
+                                       Defaults to 0.
     """
+    # Mention the skipped images only if there are any
+    skipped_info = f", {skipped_count} skipped" if skipped_count else ''
 
     if process_time < 60:
         # Display process time in seconds
         logger.info(
             f"Processing complete: "
-            f"{processed_count} images processed, {unprocessed_count} unprocessed. "
+            f"{processed_count} images processed, {unprocessed_count} unprocessed{skipped_info}. "
             f"Images processing time is {process_time:.2f} seconds."
         )
     elif 60 <= process_time < 3600:
@@ -29,7 +33,7 @@ def execution_timer(processed_count, unprocessed_count, process_time):
         process_seconds = process_time % 60
         logger.info(
             f"Processing complete: "
-            f"{processed_count} images processed, {unprocessed_count} unprocessed. "
+            f"{processed_count} images processed, {unprocessed_count} unprocessed{skipped_info}. "
             f"Images processing time is {process_minutes:.0f} minutes {process_seconds:.0f} seconds."
         )
     else:
@@ -39,7 +43,7 @@ def execution_timer(processed_count, unprocessed_count, process_time):
         process_seconds = process_time % 60
         logger.info(
             f"Processing complete: "
-            f"{processed_count} images processed, {unprocessed_count} unprocessed. "
+            f"{processed_count} images processed, {unprocessed_count} unprocessed{skipped_info}. "
             f"Images processing time is {process_hours:.0f} "
             f"{'hour' if process_hours == 1 else 'hours'} "
             f"{process_minutes:.0f} minutes {process_seconds:.0f} seconds."
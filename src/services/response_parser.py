@@ -11,8 +11,22 @@ from src.services.logging_config import setup_logger
 # Initialize logger using the setup function
 logger = setup_logger(__name__)
 
-
-def parse_response(image_file, prompt, image_caption: Optional[str] = None):
+# Translation table to map non-letter characters to None, built once for all responses
+NON_LETTERS_TABLE = str.maketrans('', '', string.punctuation + string.digits)
+
+# Delimiters between the keywords of the response
+KEYWORDS_SEPARATOR = re.compile(r'[,\s]+')
+
+
+def parse_response(
+    image_file,
+    prompt,
+    image_caption: Optional[str] = None,
+    cache=None,
+    request_template=None,
+    reuse_similar_prompts=False,
+    image_name=None,
+):
     """
     Parse the GPT-4 response to extract the title, description, and keywords.
 
@@ -20,18 +34,51 @@ def parse_response(image_file, prompt, image_caption: Optional[str] = None):
         image_file: An image file name to be processed.
         prompt (str): The prompt to be sent to the GPT model for generating descriptions.
         image_caption (Optional[str]): The caption from the image metadata, if available.
+        cache (Optional[ResponseCache]): The cache of ChatGPT responses, if enabled.
+        request_template (Optional[RequestTemplate]): The request body prepared for the prompt.
+        reuse_similar_prompts (bool): Whether to reuse the response cached for the image with
+                                      a similar prompt. Defaults to False.
+        image_name (Optional[str]): The name of the image file, to report a reused response.
 
     Returns:
         tuple: A tuple containing the title (str), description (str), and keywords (list) extracted from the GPT-4 response.
     """
-    # Get ChatGPT response
-    gpt_response = process_photo(image_file=image_file, prompt=prompt, image_caption=image_caption)
-
-    # Check if there is an error in the ChatGPT response
-    if 'error' in gpt_response.keys():
-        logger.critical(f"{gpt_response.get('error')['message']}")
-        # Exit the program with a status code 1
-        sys.exit(1)
+    # Get ChatGPT response from the cache, if available
+    gpt_response = None
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.make_key(prompt, cache.image_key(image_file), image_caption)
+        gpt_response = cache.get(cache_key)
+
+        # Match the prompts by meaning only if requested, as small edits can change the output
+        prompt_text = None
+        if reuse_similar_prompts:
+            prompt_text = f"{prompt}\n{image_caption}" if image_caption else prompt
+            if gpt_response is None:
+                gpt_response = cache.get_similar(cache_key, prompt_text)
+                if gpt_response is not None:
+                    logger.warning(
+                        f"Reused the cached response of a similar prompt for {image_name}, "
+                        "its metadata may not follow the current prompt exactly."
+                    )
+
+    if gpt_response is None:
+        # Get ChatGPT response
+        gpt_response = process_photo(
+            image_file=image_file,
+            prompt=prompt,
+            image_caption=image_caption,
+            request_template=request_template,
+        )
+
+        # Check if there is an error in the ChatGPT response
+        if 'error' in gpt_response.keys():
+            logger.critical(f"{gpt_response.get('error')['message']}")
+            # Exit the program with a status code 1
+            sys.exit(1)
+
+        if cache_key is not None:
+            cache.put(cache_key, gpt_response, prompt_text=prompt_text)
 
     try:
         content = gpt_response['choices'][0].get('message').get('content')
@@ -44,9 +91,6 @@ def parse_response(image_file, prompt, image_caption: Optional[str] = None):
         description_index = content_lower.find('description')
         keywords_index = content_lower.find('keywords')
 
-        # Define a translation table to map non-letter characters to None
-        translation_table = str.maketrans('', '', string.punctuation + string.digits)
-
         # Get the values by slicing
         title = 'No Title'
         description = 'No Description'
@@ -60,13 +104,13 @@ def parse_response(image_file, prompt, image_caption: Optional[str] = None):
                 if description_index > title_index
                 else keywords_index if keywords_index > title_index else len(content)
             )
-            title = content[start_index:end_index].translate(translation_table).strip()
+            title = content[start_index:end_index].translate(NON_LETTERS_TABLE).strip()
 
         if description_index != -1:
             # Slice until the next section or end of content
             start_index = description_index + len('Description')
             end_index = keywords_index if keywords_index > description_index else len(content)
-            description = content[start_index:end_index].translate(translation_table).strip()
+            description = content[start_index:end_index].translate(NON_LETTERS_TABLE).strip()
 
         if keywords_index != -1:
             # Slice to the end of the content and split by common delimiters
@@ -74,7 +118,9 @@ def parse_response(image_file, prompt, image_caption: Optional[str] = None):
             keywords_string = content[start_index:]
             keywords = [
                 kw.strip()
-                for kw in re.split(r'[,\s]+', keywords_string.translate(translation_table).lower())
+                for kw in KEYWORDS_SEPARATOR.split(
+                    keywords_string.translate(NON_LETTERS_TABLE).lower()
+                )
                 if kw
             ]
 